@@ -1,8 +1,20 @@
+import argparse
 import os
-from typing import List
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure Python path is used without it
+    np = None
 
 N_GRADUATIONS = 100
 DIAL_STARTING_POSITION = 50
+NUMPY_BACKEND_THRESHOLD = 10_000
+INT64_SAFE_DIGITS = 18  # any magnitude of at most 18 digits is below 10**18 < 2**63
+BACKENDS = ('auto', 'python', 'numpy')
+CHUNKS_PER_WORKER = 4
 DATA_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources')
 INPUT_P1_FILENAME = 'input.txt'
 INPUT_P2_FILENAME = 'input.txt'
@@ -11,21 +23,42 @@ INPUT_P2_FILENAME = 'input.txt'
 class SecretEntrancePasswordFinder:
     """Class to find the secret entrance password based on cumulative summation."""
     
-    def __init__(self, n_graduations: int, dial_starting_position: int, instruction_input_filename: str):
+    def __init__(self, n_graduations: int, dial_starting_position: int, instruction_input_filename: str, streaming: bool = False, backend: str = 'auto', workers: int = 1):
+        if backend not in BACKENDS:
+            raise ValueError("Unknown backend {}, expected one of {}".format(backend, BACKENDS))
+        if backend == 'numpy' and np is None:
+            raise ImportError("The numpy backend requires NumPy to be installed.")
+        self.backend = backend
         self.n_graduations = n_graduations
         self.dial_starting_position = dial_starting_position
         self.instruction_input_filename = instruction_input_filename
         self.instruction_input_filepath = os.path.join(DATA_FOLDER, instruction_input_filename)
-        self.instructions = self._load_instructions()
+        self.streaming = streaming
+        self.workers = workers
+        self.instructions = None if streaming or workers > 1 else self._load_instructions()
     
     def resolve_password(self) -> int:
         """Find the occurrences of zero position equivalent in the cumulative summation of shifts."""
+        if self.workers > 1:
+            return self.resolve_passwords_in_parallel()[0]
+        if self.streaming:
+            return self.resolve_passwords_in_one_pass()[0]
+        shifts = self._int64_shifts()
+        if shifts is not None:
+            return self._resolve_passwords_with_numpy(shifts)[0]
         self.shifts = [self._parse_instruction(instr) for instr in self.instructions]
         self.cumulative_sums = self._cumulative_sum(self.shifts, self.dial_starting_position)
         return self._count_zero_position_equivalence_after_rotation(self.cumulative_sums)
 
     def resolve_password_part2(self) -> int:
         """Find the occurrences of zero position equivalent in the cumulative summation of shifts and during the dial rotation."""
+        if self.workers > 1:
+            return self.resolve_passwords_in_parallel()[1]
+        if self.streaming:
+            return self.resolve_passwords_in_one_pass()[1]
+        shifts = self._int64_shifts()
+        if shifts is not None:
+            return self._resolve_passwords_with_numpy(shifts)[1]
         self.shifts = [self._parse_instruction(instr) for instr in self.instructions]
         self.cumulative_sums = self._cumulative_sum(self.shifts, self.dial_starting_position)
         total_zero_position_equivalence_after_rotation = self._count_zero_position_equivalence_after_rotation(self.cumulative_sums)
@@ -36,20 +69,115 @@ class SecretEntrancePasswordFinder:
         )
         total = total_zero_position_equivalence_after_rotation + total_zero_position_equivalences_during_rotation
         return total
+
+    def resolve_passwords_in_one_pass(self) -> Tuple[int, int]:
+        """Resolve the part 1 and part 2 passwords in a single pass over the input file, keeping only the current dial position in memory."""
+        position = self.dial_starting_position
+        total_zero_position_equivalence_after_rotation = 0
+        total_zero_position_equivalences_during_rotation = 0
+        for instruction in self._iterate_instructions():
+            shift = self._parse_instruction(instruction)
+            total_zero_position_equivalences_during_rotation += self._count_zero_position_equivalences_exclusively_between(position, shift, self.n_graduations)
+            position += shift
+            if position % self.n_graduations == 0:
+                total_zero_position_equivalence_after_rotation += 1
+        part_1 = total_zero_position_equivalence_after_rotation
+        part_2 = total_zero_position_equivalence_after_rotation + total_zero_position_equivalences_during_rotation
+        return part_1, part_2
+
+    def resolve_passwords_in_parallel(self) -> Tuple[int, int]:
+        """Resolve the part 1 and part 2 passwords by summarizing byte ranges of the input file in worker processes.
+        Chunk summaries are relative to the chunk's unknown starting position, and are stitched together in order by carrying the dial position."""
+        byte_ranges = self._split_input_into_byte_ranges(self.workers * CHUNKS_PER_WORKER)
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            summaries = executor.map(
+                _summarize_instruction_chunk,
+                [self.instruction_input_filepath] * len(byte_ranges),
+                [byte_start for byte_start, _ in byte_ranges],
+                [byte_end for _, byte_end in byte_ranges],
+                [self.n_graduations] * len(byte_ranges),
+            )
+            return self._stitch_chunk_summaries(summaries)
+
+    def _split_input_into_byte_ranges(self, n_chunks: int) -> List[Tuple[int, int]]:
+        """Split the input file into n_chunks byte ranges of similar size. Workers align them to line starts."""
+        file_size = os.path.getsize(self.instruction_input_filepath)
+        boundaries = sorted(set(file_size * i // n_chunks for i in range(n_chunks + 1)))
+        return list(zip(boundaries[:-1], boundaries[1:]))
+
+    def _stitch_chunk_summaries(self, summaries) -> Tuple[int, int]:
+        """Combine chunk summaries in file order, carrying the dial position from one chunk into the next."""
+        n = self.n_graduations
+        position = self.dial_starting_position
+        lines_before_chunk = 0
+        total_zero_position_equivalence_after_rotation = 0
+        total_zero_position_equivalences_during_rotation = 0
+        for summary in summaries:
+            if summary.invalid_line is not None:
+                line_num_in_chunk, line = summary.invalid_line
+                raise ValueError("Invalid instruction found on line {}: {}".format(lines_before_chunk + line_num_in_chunk, line))
+            residue = position % n
+            total_zero_position_equivalence_after_rotation += summary.landing_residues[-residue % n]
+            total_zero_position_equivalences_during_rotation += summary.base_crossings + sum(
+                correction for correction_residue, correction in summary.crossing_corrections.items() if correction_residue >= n - residue)
+            position += summary.net_shift
+            lines_before_chunk += summary.n_lines
+        part_1 = total_zero_position_equivalence_after_rotation
+        part_2 = total_zero_position_equivalence_after_rotation + total_zero_position_equivalences_during_rotation
+        return part_1, part_2
+
+    def _int64_shifts(self):
+        """The shifts as an int64 array when the NumPy backend should resolve them, otherwise None.
+        The auto backend switches to NumPy for inputs of at least NUMPY_BACKEND_THRESHOLD instructions, when NumPy is available.
+        Either backend falls back to the Python path when a shift or a dial position might not fit in int64: every magnitude
+        must have at most INT64_SAFE_DIGITS digits, and the start position plus the total of |shifts| must stay below 2**62,
+        so no cumulative position, nor one less than it, can wrap around. The file is parsed once, and only when NumPy is used."""
+        if self.backend == 'auto':
+            use_numpy = np is not None and len(self.instructions) >= NUMPY_BACKEND_THRESHOLD
+        else:
+            use_numpy = self.backend == 'numpy'
+        if not use_numpy or max((len(instruction) - 1 for instruction in self.instructions), default=0) > INT64_SAFE_DIGITS:
+            return None
+        signed_magnitudes = ' '.join(self.instructions).replace('R', '').replace('L', '-')
+        shifts = np.fromstring(signed_magnitudes, dtype=np.int64, sep=' ')
+        if float(np.abs(shifts).sum(dtype=np.float64)) + abs(self.dial_starting_position) >= 2 ** 62:
+            return None
+        return shifts
+
+    def _resolve_passwords_with_numpy(self, shifts) -> Tuple[int, int]:
+        """Resolve the part 1 and part 2 passwords with int64 arrays instead of Python loops.
+        The shifts come from _int64_shifts, which checks that they and the positions fit into int64."""
+        n = self.n_graduations
+        ending_positions = np.cumsum(shifts) + self.dial_starting_position
+        starting_positions = np.concatenate(([self.dial_starting_position], ending_positions)).astype(np.int64)[:-1]
+
+        total_zero_position_equivalence_after_rotation = int(np.count_nonzero(ending_positions % n == 0))
+        crossings_rightwards = (ending_positions - 1) // n - starting_positions // n
+        crossings_leftwards = (starting_positions - 1) // n - ending_positions // n
+        crossings = np.where(shifts > 0, crossings_rightwards, np.where(shifts < 0, crossings_leftwards, 0))
+        total_zero_position_equivalences_during_rotation = int(crossings.sum())
+
+        part_1 = total_zero_position_equivalence_after_rotation
+        part_2 = total_zero_position_equivalence_after_rotation + total_zero_position_equivalences_during_rotation
+        return part_1, part_2
     
     def _load_instructions(self) -> List[str]:
         """Load instructions from the input file."""
+        return list(self._iterate_instructions())
+
+    def _iterate_instructions(self) -> Iterator[str]:
+        """Lazily yield validated instructions from the input file, one line at a time."""
         def _is_valid_instruction(instruction: str) -> bool:
             return (instruction and 
                     instruction[0] in ('R', 'L') and 
                     instruction[1:].isdigit())
         
         with open(self.instruction_input_filepath, 'r') as file:
-            lines = [line.strip() for line in file.readlines()]
-            for line_num, line in enumerate(lines, start=1):
+            for line_num, line in enumerate(file, start=1):
+                line = line.strip()
                 if not _is_valid_instruction(line):
                     raise ValueError("Invalid instruction found on line {}: {}".format(line_num, line))
-            return lines
+                yield line
 
     def _parse_instruction(self, instruction: str) -> int:
             """Map the instructions to shifts as signed integers, where R is positive and L is negative."""
@@ -82,7 +210,16 @@ class SecretEntrancePasswordFinder:
         return count
     
     def _count_zero_position_equivalences_exclusively_between(self, starting_position: int, shift: int, n_graduations: int) -> int:
-        """Count how many zero position equivalents are found between two positions. Both positions exclusive."""
+        """Count how many zero position equivalents are found between two positions. Both positions exclusive.
+        Multiples of n_graduations up to x are counted by floor(x / n_graduations), so the count is a difference of two floor divisions."""
+        if shift > 0:
+            return (starting_position + shift - 1) // n_graduations - starting_position // n_graduations
+        if shift < 0:
+            return (starting_position - 1) // n_graduations - (starting_position + shift) // n_graduations
+        return 0
+
+    def _count_zero_position_equivalences_exclusively_between_by_walking(self, starting_position: int, shift: int, n_graduations: int) -> int:
+        """Reference implementation of _count_zero_position_equivalences_exclusively_between, visiting every position in between."""
         count = 0
 
         step = 1 if shift > 0 else -1
@@ -92,11 +229,68 @@ class SecretEntrancePasswordFinder:
         return count
 
 
+class _InstructionChunkSummary(NamedTuple):
+    """Summary of a chunk of instructions, relative to a chunk starting position of 0.
+    For a real starting position p with residue r = p mod n_graduations:
+    - positions landing on zero are landing_residues[-r mod n_graduations]
+    - zero crossings are base_crossings plus the crossing_corrections of all residues >= n_graduations - r
+    The per-residue counts are sparse Counters, so a summary grows with the chunk's lines rather than with n_graduations.
+    """
+    n_lines: int
+    net_shift: int
+    landing_residues: Counter
+    base_crossings: int
+    crossing_corrections: Counter
+    invalid_line: Optional[Tuple[int, str]]
+
+
+def _summarize_instruction_chunk(filepath: str, byte_start: int, byte_end: int, n_graduations: int) -> _InstructionChunkSummary:
+    """Summarize the instructions whose line starts within [byte_start, byte_end) of the file.
+    Uses floor((r + x) / n) = floor(x / n) + [x mod n >= n - r] to keep the crossing count independent of the starting residue r."""
+    n = n_graduations
+    n_lines = 0
+    position = 0
+    landing_residues = Counter()
+    base_crossings = 0
+    crossing_corrections = Counter()
+    with open(filepath, 'rb') as file:
+        offset = byte_start
+        if byte_start > 0:
+            file.seek(byte_start - 1)
+            offset += len(file.readline()) - 1  # The partial line belongs to the previous chunk
+        while offset < byte_end:
+            raw_line = file.readline()
+            if not raw_line:
+                break
+            offset += len(raw_line)
+            n_lines += 1
+            instruction = raw_line.strip().decode()
+            if not (instruction and instruction[0] in ('R', 'L') and instruction[1:].isdigit()):
+                return _InstructionChunkSummary(n_lines, position, landing_residues, base_crossings, crossing_corrections, (n_lines, instruction))
+            shift = int(instruction[1:]) if instruction[0] == 'R' else -int(instruction[1:])
+            next_position = position + shift
+            if shift > 0:
+                base_crossings += (next_position - 1) // n - position // n
+                crossing_corrections[(next_position - 1) % n] += 1
+                crossing_corrections[position % n] -= 1
+            elif shift < 0:
+                base_crossings += (position - 1) // n - next_position // n
+                crossing_corrections[(position - 1) % n] += 1
+                crossing_corrections[next_position % n] -= 1
+            landing_residues[next_position % n] += 1
+            position = next_position
+    return _InstructionChunkSummary(n_lines, position, landing_residues, base_crossings, crossing_corrections, None)
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Day 1: Secret Entrance")
+    parser.add_argument('--workers', type=int, default=1, help="Number of worker processes evaluating chunks of the input file.")
+    args = parser.parse_args()
+
     print("======Day 1, Part 1======")
-    part_1_answer = SecretEntrancePasswordFinder(N_GRADUATIONS, DIAL_STARTING_POSITION, INPUT_P1_FILENAME).resolve_password()
+    part_1_answer = SecretEntrancePasswordFinder(N_GRADUATIONS, DIAL_STARTING_POSITION, INPUT_P1_FILENAME, workers=args.workers).resolve_password()
     print("Answer: ", part_1_answer)
     print("")
     print("======Day 1, Part 2======")
-    part_2_answer = SecretEntrancePasswordFinder(N_GRADUATIONS, DIAL_STARTING_POSITION, INPUT_P2_FILENAME).resolve_password_part2()
+    part_2_answer = SecretEntrancePasswordFinder(N_GRADUATIONS, DIAL_STARTING_POSITION, INPUT_P2_FILENAME, workers=args.workers).resolve_password_part2()
     print("Answer: ", part_2_answer)
\ No newline at end of file
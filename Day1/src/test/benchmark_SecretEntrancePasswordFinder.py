@@ -0,0 +1,73 @@
+import os
+import random
+import tempfile
+import time
+from day1.src.main.python.SecretEntrancePasswordFinder import SecretEntrancePasswordFinder, N_GRADUATIONS, DIAL_STARTING_POSITION
+
+
+def _write_instructions(n_instructions: int, max_magnitude: int, seed: int = 42) -> str:
+    """Write a random instruction file and return its path."""
+    rng = random.Random(seed)
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as file:
+        file.write('\n'.join(f"{rng.choice('RL')}{rng.randint(0, max_magnitude)}" for _ in range(n_instructions)))
+        return file.name
+
+
+def _time(fn) -> tuple:
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def benchmark_closed_form_against_walking():
+    """Compare the floor-division crossing counter with the walking reference on huge-magnitude instructions."""
+    print("======Closed-form vs walking zero crossing count======")
+    for n_instructions, max_magnitude in [(1000, 10_000), (1000, 100_000), (100_000, 100_000_000)]:
+        filepath = _write_instructions(n_instructions, max_magnitude)
+        finder = SecretEntrancePasswordFinder(N_GRADUATIONS, DIAL_STARTING_POSITION, filepath)
+        closed_form_answer, closed_form_seconds = _time(finder.resolve_password_part2)
+        print(f"{n_instructions} instructions up to {max_magnitude}: closed-form {closed_form_seconds:.4f}s", end='')
+        if n_instructions * max_magnitude <= 10 ** 8:
+            finder._count_zero_position_equivalences_exclusively_between = finder._count_zero_position_equivalences_exclusively_between_by_walking
+            walking_answer, walking_seconds = _time(finder.resolve_password_part2)
+            assert walking_answer == closed_form_answer
+            print(f", walking {walking_seconds:.4f}s", end='')
+        print()
+        os.remove(filepath)
+
+
+def benchmark_numpy_against_python_backend():
+    """Compare the NumPy batch backend with the pure Python backend on growing instruction streams."""
+    print("======NumPy vs pure Python backend======")
+    for n_instructions in [10_000, 100_000, 1_000_000]:
+        filepath = _write_instructions(n_instructions, 1000)
+        python_finder = SecretEntrancePasswordFinder(N_GRADUATIONS, DIAL_STARTING_POSITION, filepath, backend='python')
+        python_answer, python_seconds = _time(python_finder.resolve_password_part2)
+        numpy_finder = SecretEntrancePasswordFinder(N_GRADUATIONS, DIAL_STARTING_POSITION, filepath, backend='numpy')
+        numpy_answer, numpy_seconds = _time(numpy_finder.resolve_password_part2)
+        assert numpy_answer == python_answer
+        print(f"{n_instructions} instructions: python {python_seconds:.4f}s, numpy {numpy_seconds:.4f}s")
+        os.remove(filepath)
+
+
+def benchmark_parallel_scaling(n_instructions: int = 2_000_000):
+    """Measure the speedup of the chunked worker-process evaluation over the one-pass evaluation."""
+    print("======Parallel chunked evaluation scaling======")
+    filepath = _write_instructions(n_instructions, 1000)
+    streaming_finder = SecretEntrancePasswordFinder(N_GRADUATIONS, DIAL_STARTING_POSITION, filepath, streaming=True)
+    expected, baseline_seconds = _time(streaming_finder.resolve_passwords_in_one_pass)
+    print(f"{n_instructions} instructions: one pass {baseline_seconds:.4f}s")
+    workers = 2
+    while workers <= (os.cpu_count() or 1) * 2:
+        parallel_finder = SecretEntrancePasswordFinder(N_GRADUATIONS, DIAL_STARTING_POSITION, filepath, workers=workers)
+        answer, seconds = _time(parallel_finder.resolve_passwords_in_parallel)
+        assert answer == expected
+        print(f"{workers} workers: {seconds:.4f}s, speedup {baseline_seconds / seconds:.2f}x")
+        workers *= 2
+    os.remove(filepath)
+
+
+if __name__ == "__main__":
+    benchmark_closed_form_against_walking()
+    benchmark_numpy_against_python_backend()
+    benchmark_parallel_scaling()
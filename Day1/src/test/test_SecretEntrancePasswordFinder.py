@@ -1,5 +1,7 @@
 import pytest
+import random
 from day1.src.main.python.SecretEntrancePasswordFinder import SecretEntrancePasswordFinder
+import day1.src.main.python.SecretEntrancePasswordFinder as module
 
 class TestSecretEntrancePasswordFinder:
     """Test suite for SecretEntrancePasswordFinder class"""
@@ -204,3 +206,201 @@ class TestSecretEntrancePasswordFinder:
         assert finder._count_zero_position_equivalences_exclusively_between(0, 100, 100) == 0
         assert finder._count_zero_position_equivalences_exclusively_between(50, 100, 100) == 1
 
+
+
+    # Tests for _count_zero_position_equivalences_exclusively_between against the walking reference
+    @pytest.mark.parametrize("seed", range(5))
+    def test_count_zero_position_equivalences_exclusively_between_matches_walking_reference(self, finder, seed):
+        """Property: the closed-form count equals the position-by-position count for random inputs"""
+        rng = random.Random(seed)
+        for _ in range(200):
+            n_graduations = rng.randint(1, 150)
+            starting_position = rng.randint(-1000, 1000)
+            shift = rng.randint(-1000, 1000)
+            expected = finder._count_zero_position_equivalences_exclusively_between_by_walking(starting_position, shift, n_graduations)
+            assert finder._count_zero_position_equivalences_exclusively_between(starting_position, shift, n_graduations) == expected
+
+    def test_count_zero_position_equivalences_exclusively_between_huge_shift(self, finder):
+        """Test that a huge shift is counted without walking every position"""
+        assert finder._count_zero_position_equivalences_exclusively_between(50, 100000000, 100) == 1000000
+        assert finder._count_zero_position_equivalences_exclusively_between(50, -100000000, 100) == 1000000
+
+    # Tests for streaming mode
+    def test_streaming_mode_does_not_load_instructions(self, tmp_path):
+        """Test that streaming mode keeps no instruction list"""
+        test_file = tmp_path / "stream_input.txt"
+        test_file.write_text("R5\nL3\nR10")
+
+        finder = SecretEntrancePasswordFinder(100, 50, str(test_file), streaming=True)
+
+        assert finder.instructions is None
+
+    def test_resolve_passwords_in_one_pass_matches_materialized(self, tmp_path):
+        """Test that the one-pass resolution matches both materialized resolutions"""
+        rng = random.Random(0)
+        test_file = tmp_path / "stream_input.txt"
+        test_file.write_text("\n".join(f"{rng.choice('RL')}{rng.randint(0, 1000)}" for _ in range(500)))
+
+        materialized = SecretEntrancePasswordFinder(100, 50, str(test_file))
+        streaming = SecretEntrancePasswordFinder(100, 50, str(test_file), streaming=True)
+
+        assert streaming.resolve_passwords_in_one_pass() == (materialized.resolve_password(), materialized.resolve_password_part2())
+        assert streaming.resolve_password() == materialized.resolve_password()
+        assert streaming.resolve_password_part2() == materialized.resolve_password_part2()
+
+    def test_streaming_mode_reports_invalid_line_number(self, tmp_path):
+        """Test that streaming mode reports invalid instructions with their line number"""
+        test_file = tmp_path / "invalid_input.txt"
+        test_file.write_text("R5\nL3\nX10")
+
+        finder = SecretEntrancePasswordFinder(100, 50, str(test_file), streaming=True)
+
+        with pytest.raises(ValueError, match="Invalid instruction found on line 3: X10"):
+            finder.resolve_password_part2()
+
+    # Tests for backend selection
+    def test_unknown_backend_raises(self, tmp_path):
+        """Test that an unknown backend name raises ValueError"""
+        test_file = tmp_path / "input.txt"
+        test_file.write_text("R5")
+
+        with pytest.raises(ValueError, match="Unknown backend"):
+            SecretEntrancePasswordFinder(100, 50, str(test_file), backend='gpu')
+
+    def test_auto_backend_uses_python_below_threshold(self, finder):
+        """Test that the auto backend stays on pure Python for small inputs"""
+        finder.backend = 'auto'
+        assert finder._int64_shifts() is None
+
+    def test_python_backend_never_uses_numpy(self, finder):
+        """Test that the python backend is honoured regardless of input size"""
+        finder.backend = 'python'
+        finder.instructions = ['R1'] * (module.NUMPY_BACKEND_THRESHOLD + 1)
+        assert finder._int64_shifts() is None
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_numpy_backend_matches_python_backend(self, tmp_path, seed):
+        """Test that the NumPy backend gives the same passwords as the pure Python backend"""
+        pytest.importorskip("numpy")
+        rng = random.Random(seed)
+        test_file = tmp_path / "input.txt"
+        test_file.write_text("\n".join(f"{rng.choice('RL')}{rng.randint(0, 1000)}" for _ in range(500)) + "\nR0\nL0\nL50\nR200")
+
+        python_finder = SecretEntrancePasswordFinder(100, 50, str(test_file), backend='python')
+        numpy_finder = SecretEntrancePasswordFinder(100, 50, str(test_file), backend='numpy')
+
+        assert numpy_finder.resolve_password() == python_finder.resolve_password()
+        assert numpy_finder.resolve_password_part2() == python_finder.resolve_password_part2()
+
+    def test_numpy_backend_empty_input(self, tmp_path):
+        """Test that the NumPy backend handles an empty instruction file"""
+        pytest.importorskip("numpy")
+        test_file = tmp_path / "empty.txt"
+        test_file.write_text("")
+
+        finder = SecretEntrancePasswordFinder(100, 50, str(test_file), backend='numpy')
+
+        assert finder.resolve_password_part2() == 0
+
+    @pytest.mark.parametrize("backend", ['auto', 'numpy'])
+    @pytest.mark.parametrize("huge_instructions", [
+        ["R99999999999999999999", "L99999999999999999999"],
+        ["R999999999999999999"] * 10,
+    ])
+    def test_numpy_backend_falls_back_beyond_int64(self, tmp_path, backend, huge_instructions):
+        """Test that magnitudes or dial positions that may overflow int64 are resolved by the Python path"""
+        pytest.importorskip("numpy")
+        test_file = tmp_path / "huge.txt"
+        test_file.write_text('\n'.join(['R1'] * module.NUMPY_BACKEND_THRESHOLD + huge_instructions))
+
+        finder = SecretEntrancePasswordFinder(100, 50, str(test_file), backend=backend)
+        python_finder = SecretEntrancePasswordFinder(100, 50, str(test_file), backend='python')
+        streaming_finder = SecretEntrancePasswordFinder(100, 50, str(test_file), streaming=True)
+
+        assert finder._int64_shifts() is None
+        assert finder.resolve_password_part2() == python_finder.resolve_password_part2() == streaming_finder.resolve_password_part2()
+        assert finder.resolve_password() == python_finder.resolve_password()
+
+    def test_numpy_backend_parses_the_instructions_once(self, tmp_path, monkeypatch):
+        """Test that the int64 fit check and the NumPy resolution share one parse of the instructions"""
+        np = pytest.importorskip("numpy")
+        test_file = tmp_path / "input.txt"
+        test_file.write_text("R50\nL100\nR5\nL205")
+        calls = []
+        monkeypatch.setattr(np, "fromstring", lambda *args, _fromstring=np.fromstring, **kwargs: calls.append(args) or _fromstring(*args, **kwargs))
+
+        finder = SecretEntrancePasswordFinder(100, 50, str(test_file), backend='numpy')
+
+        assert finder.resolve_password_part2() == 5
+        assert len(calls) == 1
+
+    def test_auto_backend_falls_back_without_numpy(self, finder, monkeypatch):
+        """Test that the auto backend falls back to pure Python when NumPy is missing"""
+        monkeypatch.setattr(module, "np", None)
+        finder.backend = 'auto'
+        finder.instructions = ['R1'] * (module.NUMPY_BACKEND_THRESHOLD + 1)
+        assert finder._int64_shifts() is None
+
+    # Tests for parallel chunked evaluation
+    def test_parallel_mode_does_not_load_instructions(self, tmp_path):
+        """Test that parallel mode leaves instruction loading to the workers"""
+        test_file = tmp_path / "input.txt"
+        test_file.write_text("R5\nL3\nR10")
+
+        finder = SecretEntrancePasswordFinder(100, 50, str(test_file), workers=2)
+
+        assert finder.instructions is None
+
+    @pytest.mark.parametrize("n_chunks", [1, 2, 7, 50])
+    def test_stitched_chunk_summaries_match_one_pass(self, tmp_path, n_chunks):
+        """Test that stitching chunk summaries of any split gives the one-pass passwords"""
+        rng = random.Random(n_chunks)
+        test_file = tmp_path / "input.txt"
+        test_file.write_text("\n".join(f"{rng.choice('RL')}{rng.randint(0, 1000)}" for _ in range(300)) + "\nR0\nL50\nR100\n")
+
+        finder = SecretEntrancePasswordFinder(100, 50, str(test_file), streaming=True)
+        summaries = [
+            module._summarize_instruction_chunk(str(test_file), byte_start, byte_end, 100)
+            for byte_start, byte_end in finder._split_input_into_byte_ranges(n_chunks)
+        ]
+
+        assert sum(summary.n_lines for summary in summaries) == 303
+        assert finder._stitch_chunk_summaries(summaries) == finder.resolve_passwords_in_one_pass()
+
+    def test_chunk_summaries_stay_sparse_for_a_large_dial(self, tmp_path):
+        """Test that chunk summaries grow with the chunk's lines rather than the number of graduations"""
+        rng = random.Random(0)
+        test_file = tmp_path / "input.txt"
+        test_file.write_text("\n".join(f"{rng.choice('RL')}{rng.randint(0, 3 * 10 ** 9)}" for _ in range(300)) + "\nL500000000\n")
+
+        finder = SecretEntrancePasswordFinder(10 ** 9, 5 * 10 ** 8, str(test_file), streaming=True)
+        summaries = [
+            module._summarize_instruction_chunk(str(test_file), byte_start, byte_end, 10 ** 9)
+            for byte_start, byte_end in finder._split_input_into_byte_ranges(7)
+        ]
+
+        assert all(len(summary.landing_residues) + len(summary.crossing_corrections) <= 3 * summary.n_lines for summary in summaries)
+        assert finder._stitch_chunk_summaries(summaries) == finder.resolve_passwords_in_one_pass()
+
+    def test_parallel_mode_matches_one_pass(self, tmp_path):
+        """Test that resolving with worker processes gives the one-pass passwords"""
+        rng = random.Random(0)
+        test_file = tmp_path / "input.txt"
+        test_file.write_text("\n".join(f"{rng.choice('RL')}{rng.randint(0, 1000)}" for _ in range(1000)))
+
+        parallel = SecretEntrancePasswordFinder(100, 50, str(test_file), workers=2)
+        streaming = SecretEntrancePasswordFinder(100, 50, str(test_file), streaming=True)
+
+        assert parallel.resolve_passwords_in_parallel() == streaming.resolve_passwords_in_one_pass()
+        assert parallel.resolve_password() == streaming.resolve_password()
+        assert parallel.resolve_password_part2() == streaming.resolve_password_part2()
+
+    def test_parallel_mode_reports_invalid_line_number(self, tmp_path):
+        """Test that parallel mode reports invalid instructions with their line number in the whole file"""
+        test_file = tmp_path / "invalid_input.txt"
+        test_file.write_text("R5\n" * 100 + "X10\n" + "L3\n" * 100)
+
+        finder = SecretEntrancePasswordFinder(100, 50, str(test_file), workers=2)
+
+        with pytest.raises(ValueError, match="Invalid instruction found on line 101: X10"):
+            finder.resolve_password()
@@ -1,8 +1,124 @@
-from math import sqrt
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heapify, heappop, heappush, merge
+from itertools import combinations
+from math import ceil, prod, sqrt
 import os
-from typing import List, Tuple
+import re
+import time
+from typing import Iterable, Iterator, List, NamedTuple, Tuple, Union
 
 RESOURCES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'resources')
+REPEATING_TWICE = 'twice'
+REPEATING_AT_LEAST_TWICE = 'at_least_twice'
+MODES = (REPEATING_TWICE, REPEATING_AT_LEAST_TWICE)
+READ_BUFFER_SIZE = 64 * 1024
+RANGE_TOKEN_SEPARATORS = re.compile(r'([,\n])')
+
+_POWERS_OF_TEN = [1]
+
+
+def _powers_of_ten_up_to(value: int) -> List[int]:
+    """Extend the shared table of powers of ten until its last entry exceeds value."""
+    while _POWERS_OF_TEN[-1] <= value:
+        _POWERS_OF_TEN.append(_POWERS_OF_TEN[-1] * 10)
+    return _POWERS_OF_TEN
+
+
+def _power_of_ten(exponent: int) -> int:
+    """Look up 10 ** exponent in the shared table."""
+    while len(_POWERS_OF_TEN) <= exponent:
+        _POWERS_OF_TEN.append(_POWERS_OF_TEN[-1] * 10)
+    return _POWERS_OF_TEN[exponent]
+
+
+def _repeating_multiplier(unit_length: int, repeat_count: int) -> int:
+    """Multiplier turning a unit of unit_length digits into the unit repeated repeat_count times, e.g. 101 for (2, 2) and 1001001 for (3, 3)."""
+    return (_power_of_ten(unit_length * repeat_count) - 1) // (_power_of_ten(unit_length) - 1)
+
+
+def _prime_divisors(value: int) -> List[int]:
+    """Distinct prime divisors of value, by trial division."""
+    primes = []
+    divisor = 2
+    while divisor * divisor <= value:
+        if value % divisor == 0:
+            primes.append(divisor)
+            while value % divisor == 0:
+                value //= divisor
+        divisor += 1
+    if value > 1:
+        primes.append(value)
+    return primes
+
+
+def _count_digits(value: int) -> int:
+    """Number of decimal digits of a non-negative value."""
+    return max(1, bisect_right(_powers_of_ten_up_to(value), value))
+
+
+def _split_range_by_magnitude(start: int, end: int) -> List[Tuple[int, int]]:
+    """Break down a range into sub-ranges of the same magnitude."""
+    ranges = []
+    current_start = start
+    while current_start <= end:
+        current_end = min(end, _power_of_ten(_count_digits(current_start)) - 1)
+        ranges.append((current_start, current_end))
+        current_start = current_end + 1
+    return ranges
+
+
+def _invalid_id_progression(start: int, end: int, repeating_count: int) -> range:
+    """The IDs repeating a unit repeating_count times in a range whose digit length is divisible by repeating_count, as a lazy range."""
+    multiplier = _repeating_multiplier(_count_digits(start) // repeating_count, repeating_count)
+    first_unit = -(-start // multiplier)
+    last_unit = end // multiplier
+    return range(first_unit * multiplier, last_unit * multiplier + 1, multiplier)
+
+
+class WorkerReport(NamedTuple):
+    """What one worker process did during a parallel search."""
+    worker_index: int
+    n_work_units: int
+    n_estimated_candidates: int
+    n_invalid_ids: int
+    seconds: float
+
+
+def _generate_invalid_ids_for_work_units(work_units: List[Tuple[int, int, int]]) -> Tuple[List[List[int]], float]:
+    """Generate the invalid IDs of each (start, end, repeating_count) work unit, and time the whole batch."""
+    started_at = time.perf_counter()
+    results = [list(_invalid_id_progression(start, end, repeating_count)) for start, end, repeating_count in work_units]
+    return results, time.perf_counter() - started_at
+
+
+class IdRangeIndex:
+    """Sorted, merged ID ranges, normalized once and split by magnitude.
+    Overlapping, duplicated and adjacent input ranges collapse, so every ID is covered by exactly one sub-range."""
+
+    def __init__(self, ranges: Iterable[Tuple[int, int]]):
+        self.merged_ranges = self._merge(ranges)
+        self.ranges_of_same_magnitude = [
+            magnitude_range
+            for start, end in self.merged_ranges
+            for magnitude_range in _split_range_by_magnitude(start, end)
+        ]
+
+    def _merge(self, ranges: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Sort the ranges by start and merge overlapping or adjacent ones."""
+        merged_ranges = []
+        current_start, current_end = None, None
+        for start, end in sorted(ranges):
+            if current_end is not None and start <= current_end + 1:
+                current_end = max(current_end, end)
+            else:
+                if current_end is not None:
+                    merged_ranges.append((current_start, current_end))
+                current_start, current_end = start, end
+        if current_end is not None:
+            merged_ranges.append((current_start, current_end))
+        return merged_ranges
+
 
 class InvalidIdIdentifier():
     """Exception raised for invalid ID identifiers."""
@@ -10,6 +126,16 @@ class InvalidIdIdentifier():
         self.input_filename = input_filename
         self.ranges = self._load_ranges_from_txt(input_filename)
 
+    @property
+    def ranges(self) -> List[Tuple[int, int]]:
+        return self._ranges
+
+    @ranges.setter
+    def ranges(self, ranges: List[Tuple[int, int]]):
+        """Replacing the ranges rebuilds the shared range index."""
+        self._ranges = ranges
+        self.range_index = IdRangeIndex(ranges)
+
     # Part 1
     def resolve_when_invalid_id_means_repeating_twice(self) -> List[int]:
         """Resolve the number of invalid IDs when invalid IDs are those with repeating twice."""
@@ -19,29 +145,148 @@ class InvalidIdIdentifier():
     # Part 2
     def resolve_when_invalid_id_means_repeating_at_least_twice(self) -> List[int]:
         """Resolve the number of invalid IDs when invalid IDs are those with repeating at least twice."""
-        max_range_end = max([pair[1] for pair in self.ranges])
-        min_repeating_count = 2
-        max_repeating_count = len(str(max_range_end))
+        return list(self.iterate_invalid_ids_repeating_at_least_twice())
+
+    def iterate_invalid_ids_repeating_at_least_twice(self) -> Iterator[int]:
+        """Yield every ID repeating a unit at least twice exactly once, in increasing order.
+        A repetition k times is also a repetition p times for every prime p dividing k, so only the prime divisors
+        of each magnitude's length are tried, and their sorted progressions are merged lazily."""
+        for magnitude_start, magnitude_end in self.range_index.ranges_of_same_magnitude:
+            progressions = [
+                self._invalid_id_progression(magnitude_start, magnitude_end, prime)
+                for prime in _prime_divisors(self._digits(magnitude_start))
+            ]
+            last_invalid_id = None
+            for invalid_id in merge(*progressions):
+                if invalid_id != last_invalid_id:
+                    yield invalid_id
+                    last_invalid_id = invalid_id
+
+    def count_and_sum_invalid_ids(self, ranges: Union[IdRangeIndex, Iterable[Tuple[int, int]]], mode: str) -> Tuple[int, int]:
+        """Count and sum the invalid IDs in the ranges without enumerating them.
+        In REPEATING_TWICE mode, matches len() and sum() of resolve_when_invalid_id_means_repeating_twice.
+        In REPEATING_AT_LEAST_TWICE mode, matches len() and sum() of resolve_when_invalid_id_means_repeating_at_least_twice."""
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode}, expected one of {MODES}.")
+        range_index = ranges if isinstance(ranges, IdRangeIndex) else IdRangeIndex(ranges)
+
+        total_count = 0
+        total_sum = 0
+        for magnitude_start, magnitude_end in range_index.ranges_of_same_magnitude:
+            for repeating_count, sign in self._signed_repeating_counts(self._digits(magnitude_start), mode):
+                count, subtotal = self._count_and_sum_invalid_ids_within_same_magnitude(magnitude_start, magnitude_end, repeating_count)
+                total_count += sign * count
+                total_sum += sign * subtotal
+        return total_count, total_sum
+
+    def _signed_repeating_counts(self, n_digits: int, mode: str) -> List[Tuple[int, int]]:
+        """Repeating counts to evaluate for IDs of n_digits digits, with their inclusion-exclusion sign.
+        A repetition k times is also a repetition p times for every prime p dividing k, so IDs repeating at least twice are
+        the union over prime divisors p of n_digits. IDs repeating p1, ..., pj times at once are exactly those repeating p1 * ... * pj times."""
+        if mode == REPEATING_TWICE:
+            return [(2, 1)] if n_digits % 2 == 0 else []
+        primes = _prime_divisors(n_digits)
+        return [
+            (prod(subset), 1 if len(subset) % 2 == 1 else -1)
+            for size in range(1, len(primes) + 1)
+            for subset in combinations(primes, size)
+        ]
+
+    def _count_and_sum_invalid_ids_within_same_magnitude(self, start: int, end: int, repeating_count: int) -> Tuple[int, int]:
+        """Count and sum the IDs repeating a unit repeating_count times, in a range whose digit length is divisible by repeating_count.
+        The IDs are unit * multiplier over consecutive units, so their sum is an arithmetic series."""
+        multiplier = _repeating_multiplier(self._digits(start) // repeating_count, repeating_count)
+        first_unit = -(-start // multiplier)
+        last_unit = end // multiplier
+        if first_unit > last_unit:
+            return 0, 0
+        count = last_unit - first_unit + 1
+        return count, multiplier * (first_unit + last_unit) * count // 2
 
-        invalid_ids = []
-        for repeating_count in range(min_repeating_count, max_repeating_count + 1):
-            invalid_ids.extend(self.search_invalid_ids_in_ranges(repeating_count))
-        return list(set(invalid_ids))  # Remove duplicates
-    
     def search_invalid_ids_in_ranges(self, repeating_count: int) -> List[int]:
-        """Search for invalid IDs in all loaded ranges."""
+        """Search for invalid IDs in all loaded ranges, each ID at most once."""
         invalid_ids = []
-        ranges_of_same_magnitude = []
-        for pair in self.ranges:
-            start, end = pair
-            ranges_of_same_magnitude.extend(self._breakdown_range_into_magnitudes(start, end))
-        for pair in ranges_of_same_magnitude:
+        for pair in self.range_index.ranges_of_same_magnitude:
             start, end = pair
             invalid_ids.extend(self.generate_invalid_ids_in_range_within_same_magnitude(start, end, repeating_count))
         return invalid_ids
 
     def generate_invalid_ids_in_range_within_same_magnitude(self, start: int, end: int, repeating_count: int) -> list:
-        """Search for invalid IDs in the given range."""
+        """Search for invalid IDs in the given range.
+        Invalid IDs are unit * multiplier for a fixed multiplier, so they step through the range by multiplier from the first unit in it."""
+        assert self._digits(start) == self._digits(end), "Range must be within the same magnitude."
+        if not self._is_a_probable_range(start, end, repeating_count):
+            return []
+
+        return list(self._invalid_id_progression(start, end, repeating_count))
+
+    def _invalid_id_progression(self, start: int, end: int, repeating_count: int) -> range:
+        """The IDs repeating a unit repeating_count times in a range whose digit length is divisible by repeating_count, as a lazy range."""
+        return _invalid_id_progression(start, end, repeating_count)
+
+    def search_invalid_ids_in_parallel(self, mode: str, workers: int) -> Tuple[List[int], List[WorkerReport]]:
+        """Search for invalid IDs in worker processes, returning the same sorted IDs as the serial path of the mode and a report per worker.
+        Each (same-magnitude range, repeat count) pair is an independent work unit. Units are balanced over the workers by their candidate count."""
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode}, expected one of {MODES}.")
+        batches = self._balance_work_units(self._plan_work_units(mode), workers)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            batch_outcomes = list(executor.map(_generate_invalid_ids_for_work_units, batches))
+
+        reports = []
+        unit_results = []
+        for worker_index, (batch, (results, seconds)) in enumerate(zip(batches, batch_outcomes)):
+            reports.append(WorkerReport(
+                worker_index=worker_index,
+                n_work_units=len(batch),
+                n_estimated_candidates=sum(len(_invalid_id_progression(*work_unit)) for work_unit in batch),
+                n_invalid_ids=sum(len(result) for result in results),
+                seconds=seconds,
+            ))
+            unit_results.extend(results)
+
+        invalid_ids = []
+        for invalid_id in merge(*unit_results):
+            if not invalid_ids or invalid_id != invalid_ids[-1]:
+                invalid_ids.append(invalid_id)
+        return invalid_ids, reports
+
+    def _plan_work_units(self, mode: str) -> List[Tuple[int, int, int]]:
+        """List the (start, end, repeating_count) work units of a mode over the same-magnitude ranges.
+        Part 2 only needs the prime repeat counts, as in iterate_invalid_ids_repeating_at_least_twice."""
+        work_units = []
+        for magnitude_start, magnitude_end in self.range_index.ranges_of_same_magnitude:
+            n_digits = self._digits(magnitude_start)
+            repeating_counts = ([2] if n_digits % 2 == 0 else []) if mode == REPEATING_TWICE else _prime_divisors(n_digits)
+            work_units.extend((magnitude_start, magnitude_end, repeating_count) for repeating_count in repeating_counts)
+        return work_units
+
+    def _balance_work_units(self, work_units: List[Tuple[int, int, int]], workers: int) -> List[List[Tuple[int, int, int]]]:
+        """Split oversized work units and assign them, largest first, to the least loaded of the workers."""
+        estimates = [len(_invalid_id_progression(*work_unit)) for work_unit in work_units]
+        target_per_worker = max(1, ceil(sum(estimates) / workers))
+
+        sized_work_units = []
+        for (start, end, repeating_count), estimate in zip(work_units, estimates):
+            n_pieces = max(1, ceil(estimate / target_per_worker))
+            width = ceil((end - start + 1) / n_pieces)
+            for piece_start in range(start, end + 1, width):
+                piece = (piece_start, min(end, piece_start + width - 1), repeating_count)
+                sized_work_units.append((len(_invalid_id_progression(*piece)), piece))
+        sized_work_units.sort(key=lambda sized_work_unit: sized_work_unit[0], reverse=True)
+
+        batches = [[] for _ in range(workers)]
+        loads = [(0, worker_index) for worker_index in range(workers)]
+        heapify(loads)
+        for estimate, work_unit in sized_work_units:
+            load, worker_index = heappop(loads)
+            batches[worker_index].append(work_unit)
+            heappush(loads, (load + estimate, worker_index))
+        return batches
+
+    def _generate_invalid_ids_in_range_within_same_magnitude_by_strings(self, start: int, end: int, repeating_count: int) -> list:
+        """Reference implementation of generate_invalid_ids_in_range_within_same_magnitude, repeating the unit as a string."""
         assert self._digits(start) == self._digits(end), "Range must be within the same magnitude."
         if not self._is_a_probable_range(start, end, repeating_count):
             return []
@@ -50,7 +295,7 @@ class InvalidIdIdentifier():
         seed_unit_start = self._first_repeating_unit(start, repeating_count)
         seed_unit_end = self._first_repeating_unit(end, repeating_count)
         for half in range(seed_unit_start, seed_unit_end + 1):
-            invalid_id = self._generating_invalid_ids(half, repeating_count)
+            invalid_id = self._generating_invalid_ids_by_strings(half, repeating_count)
             if start <= invalid_id <= end:
                 invalid_ids.append(invalid_id)
         return invalid_ids
@@ -58,24 +303,20 @@ class InvalidIdIdentifier():
     def _first_repeating_unit(self, value: int, repeat_count: int) -> int:
         """Get the repeating unit from a value based on repeat count."""
         assert self._divisible_length_by(value, repeat_count), "Value length must be divisible by repeat count."
-        str_value = str(value)
-        repeating_unit_length = len(str_value) // repeat_count
-        first_repeating_unit = str_value[:repeating_unit_length]
-        return int(first_repeating_unit)
+        n_digits = self._digits(value)
+        repeating_unit_length = n_digits // repeat_count
+        return value // _power_of_ten(n_digits - repeating_unit_length)
     
     def _breakdown_range_into_magnitudes(self, start: int, end: int) -> list:
         """Break down a range into sub-ranges of the same magnitude."""
-        ranges = []
-        current_start = start
-        while current_start <= end:
-            current_magnitude = self._digits(current_start)
-            current_end = min(end, int('9' * current_magnitude))
-            ranges.append((current_start, current_end))
-            current_start = current_end + 1
-        return ranges
+        return _split_range_by_magnitude(start, end)
     
     def _generating_invalid_ids(self, repeating_unit: int, repeat_count: int) -> int:
         """Generate an invalid ID by repeating a unit."""
+        return repeating_unit * _repeating_multiplier(self._digits(repeating_unit), repeat_count)
+
+    def _generating_invalid_ids_by_strings(self, repeating_unit: int, repeat_count: int) -> int:
+        """Reference implementation of _generating_invalid_ids, repeating the unit as a string."""
         str_unit = str(repeating_unit)
         return int(str_unit * repeat_count)
 
@@ -90,7 +331,7 @@ class InvalidIdIdentifier():
         return self._digits(start) == self._digits(end)
     
     def _digits(self, value: int) -> int:
-            return len(str(value))
+            return _count_digits(value)
     
     def _is_odd_length(self, value: int) -> bool:
         return self._digits(value) % 2 != 0
@@ -99,56 +340,67 @@ class InvalidIdIdentifier():
         return self._digits(value) % divisor == 0
 
     def _load_ranges_from_txt(self, filename: str) -> list:
-        lines = []
+        return list(self._iterate_ranges_from_txt(filename))
+
+    def _iterate_ranges_from_txt(self, filename: str, buffer_size: int = READ_BUFFER_SIZE) -> Iterator[Tuple[int, int]]:
+        """Lazily yield (start, end) pairs from a file of comma-separated ranges, reading it in fixed-size buffers.
+        Ranges may span several lines. Blank lines are skipped."""
+        BETWEEN_PAIR_SEPARATOR = ','
+        LINE_SEPARATOR = '\n'
+
+        def _iterate_tokens(file) -> Iterator[Tuple[str, str]]:
+            """Yield every range token with the separator that ends it, None at the end of the file."""
+            pending = ''
+            while True:
+                buffer = file.read(buffer_size)
+                if not buffer:
+                    break
+                *pieces, pending = RANGE_TOKEN_SEPARATORS.split(pending + buffer)
+                for i in range(0, len(pieces), 2):
+                    yield pieces[i], pieces[i + 1]
+            yield pending, None
+
         with open(os.path.join(RESOURCES_DIR, filename), 'r') as file:
-            lines = file.readlines()
-        line = lines[0]
-
-        def _parse_ranges_from_line(line: str) -> list:
-            BETWEEN_PAIR_SEPARATOR = ','
-            IN_PAIR_SEPARATOR = '-'
-
-            ranges = []
-
-            parts = line.strip().split(BETWEEN_PAIR_SEPARATOR)
-            for part in parts:
-                def _validate_range_format(part: str) -> bool:
-                    if IN_PAIR_SEPARATOR not in part:
-                        raise ValueError(f"Invalid range format: {part}, missing separator.")
-                    if part.count(IN_PAIR_SEPARATOR) != 1:
-                        raise ValueError(f"Invalid range format: {part}, multiple separators found.")
-                    if not part.replace(IN_PAIR_SEPARATOR, '').isdigit():
-                        raise ValueError(f"Invalid range format: {part}, non-numeric values found.")
-                    return True
-                
-                def _parse_range(part: str) -> tuple:
-                    pair = list(filter(lambda x: x != IN_PAIR_SEPARATOR, part.split(IN_PAIR_SEPARATOR)))
-                    try:
-                        start = int(pair[0])
-                        end = int(pair[1])
-                        if start > end:
-                            raise ValueError(f"Start of range {start} cannot be greater than end {end}.")
-                        return (start, end)
-                    except ValueError as e:
-                        raise ValueError(f"Invalid numeric values in range: {part} with error {e}")
-                
-                _validate_range_format(part)
-                pair = _parse_range(part)
-                ranges.append(pair)
-                    
-            return ranges
-        
-        return _parse_ranges_from_line(line)
+            at_line_start = True
+            for token, separator in _iterate_tokens(file):
+                part = token.strip()
+                is_blank_line = not part and at_line_start and separator != BETWEEN_PAIR_SEPARATOR
+                if not is_blank_line:
+                    yield self._parse_range(part)
+                at_line_start = separator == LINE_SEPARATOR
+
+    def _parse_range(self, part: str) -> Tuple[int, int]:
+        """Validate and parse a single 'start-end' range."""
+        IN_PAIR_SEPARATOR = '-'
+
+        def _validate_range_format(part: str) -> bool:
+            if IN_PAIR_SEPARATOR not in part:
+                raise ValueError(f"Invalid range format: {part}, missing separator.")
+            if part.count(IN_PAIR_SEPARATOR) != 1:
+                raise ValueError(f"Invalid range format: {part}, multiple separators found.")
+            if not part.replace(IN_PAIR_SEPARATOR, '').isdigit():
+                raise ValueError(f"Invalid range format: {part}, non-numeric values found.")
+            return True
 
+        _validate_range_format(part)
+        pair = part.split(IN_PAIR_SEPARATOR)
+        try:
+            start = int(pair[0])
+            end = int(pair[1])
+            if start > end:
+                raise ValueError(f"Start of range {start} cannot be greater than end {end}.")
+            return (start, end)
+        except ValueError as e:
+            raise ValueError(f"Invalid numeric values in range: {part} with error {e}")
 
 if __name__ == "__main__":
     identifier = InvalidIdIdentifier('input.txt')
 
     print("======Day 2, Part 1======")
-    invalid_ids = identifier.resolve_when_invalid_id_means_repeating_twice()
-    print("Number of invalid IDs found:", len(invalid_ids))
-    print("Sum of invalid IDs found:", sum(invalid_ids))
+    n_invalid_ids, sum_invalid_ids = identifier.count_and_sum_invalid_ids(identifier.range_index, REPEATING_TWICE)
+    print("Number of invalid IDs found:", n_invalid_ids)
+    print("Sum of invalid IDs found:", sum_invalid_ids)
     print("======Day 2, Part 2======")
-    invalid_ids_part2 = identifier.resolve_when_invalid_id_means_repeating_at_least_twice()
-    print("Number of invalid IDs found:", len(invalid_ids_part2))
-    print("Sum of invalid IDs found:", sum(invalid_ids_part2))
+    n_invalid_ids_part2, sum_invalid_ids_part2 = identifier.count_and_sum_invalid_ids(identifier.range_index, REPEATING_AT_LEAST_TWICE)
+    print("Number of invalid IDs found:", n_invalid_ids_part2)
+    print("Sum of invalid IDs found:", sum_invalid_ids_part2)
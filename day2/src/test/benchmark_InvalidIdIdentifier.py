@@ -0,0 +1,77 @@
+import os
+import random
+import tempfile
+import time
+from day2.src.main.python.InvalidIdIdentifier import InvalidIdIdentifier, REPEATING_AT_LEAST_TWICE
+
+
+def _identifier_for(ranges: str) -> InvalidIdIdentifier:
+    """Build an identifier from a comma-separated range line written to a temporary file."""
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as file:
+        file.write(ranges)
+    identifier = InvalidIdIdentifier(file.name)
+    os.remove(file.name)
+    return identifier
+
+
+def _time(fn) -> tuple:
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def benchmark_arithmetic_against_string_generation():
+    """Compare the arithmetic repeating-unit generator with the string-based reference on ranges holding millions of candidates."""
+    print("======Arithmetic vs string invalid ID generation======")
+    identifier = _identifier_for('1-10')
+    for start, end, repeating_count in [(10 ** 11, 10 ** 12 - 1, 2), (10 ** 13, 10 ** 14 - 1, 2), (10 ** 11, 10 ** 12 - 1, 3)]:
+        arithmetic_ids, arithmetic_seconds = _time(lambda: identifier.generate_invalid_ids_in_range_within_same_magnitude(start, end, repeating_count))
+        string_ids, string_seconds = _time(lambda: identifier._generate_invalid_ids_in_range_within_same_magnitude_by_strings(start, end, repeating_count))
+        assert arithmetic_ids == string_ids
+        print(f"[{start}, {end}] x{repeating_count}, {len(string_ids)} candidates: arithmetic {arithmetic_seconds:.4f}s, strings {string_seconds:.4f}s")
+
+
+def benchmark_merged_index_on_overlapping_ranges(n_ranges: int = 200_000):
+    """Compare searching the merged range index with scanning every input range on its own, for heavily overlapping ranges."""
+    print("======Merged range index on overlapping ranges======")
+    rng = random.Random(42)
+    ranges = []
+    for _ in range(n_ranges):
+        start = rng.randint(10 ** 5, 10 ** 6)
+        ranges.append((start, start + rng.randint(0, 10 ** 5)))
+    identifier = _identifier_for('1-10')
+
+    def _scan_every_range():
+        invalid_ids = []
+        for start, end in ranges:
+            for magnitude_start, magnitude_end in identifier._breakdown_range_into_magnitudes(start, end):
+                invalid_ids.extend(identifier.generate_invalid_ids_in_range_within_same_magnitude(magnitude_start, magnitude_end, 2))
+        return invalid_ids
+
+    def _search_merged_index():
+        identifier.ranges = ranges
+        return identifier.search_invalid_ids_in_ranges(2)
+
+    scanned_ids, scan_seconds = _time(_scan_every_range)
+    indexed_ids, index_seconds = _time(_search_merged_index)
+    assert indexed_ids == sorted(set(scanned_ids))
+    print(f"{n_ranges} ranges into {len(identifier.range_index.merged_ranges)} merged ranges: "
+          f"per-range scan {scan_seconds:.4f}s ({len(scanned_ids)} IDs), merged index {index_seconds:.4f}s ({len(indexed_ids)} IDs)")
+
+
+def benchmark_parallel_search(workers: int = 4):
+    """Compare the process-pool search with the serial generator, and print the per-worker timings."""
+    print("======Parallel invalid ID search======")
+    identifier = _identifier_for(f"1-{10 ** 12},{10 ** 13}-{2 * 10 ** 13}")
+    serial_ids, serial_seconds = _time(identifier.resolve_when_invalid_id_means_repeating_at_least_twice)
+    (parallel_ids, reports), parallel_seconds = _time(lambda: identifier.search_invalid_ids_in_parallel(REPEATING_AT_LEAST_TWICE, workers))
+    assert parallel_ids == serial_ids
+    print(f"{len(serial_ids)} IDs: serial {serial_seconds:.4f}s, {workers} workers {parallel_seconds:.4f}s")
+    for report in reports:
+        print(f"  worker {report.worker_index}: {report.n_work_units} units, {report.n_estimated_candidates} candidates, {report.seconds:.4f}s")
+
+
+if __name__ == "__main__":
+    benchmark_arithmetic_against_string_generation()
+    benchmark_merged_index_on_overlapping_ranges()
+    benchmark_parallel_search()
@@ -1,7 +1,9 @@
 import pytest
 import os
+import random
 import tempfile
 from day2.src.main.python.InvalidIdIdentifier import InvalidIdIdentifier
+from day2.src.main.python.InvalidIdIdentifier import IdRangeIndex
 import day2.src.main.python.InvalidIdIdentifier as module
 
 
@@ -101,6 +103,14 @@ class TestLoadRangesFromTxt:
         with pytest.raises(ValueError):
             InvalidIdIdentifier(filename)
     
+    def test_load_multiple_lines(self, mock_resources_dir):
+        """Test loading ranges spread over several lines."""
+        filename = 'test7.txt'
+        with open(os.path.join(mock_resources_dir, filename), 'w') as f:
+            f.write('1-10,20-30\n100-200\n\n')
+        identifier = InvalidIdIdentifier(filename)
+        assert identifier.ranges == [(1, 10), (20, 30), (100, 200)]
+
     def test_invalid_range_start_greater_than_end(self, mock_resources_dir):
         """Test invalid range where start > end."""
         filename = 'test6.txt'
@@ -109,6 +119,36 @@ class TestLoadRangesFromTxt:
         with pytest.raises(ValueError):
             InvalidIdIdentifier(filename)
 
+class TestIterateRangesFromTxt:
+
+    @pytest.mark.parametrize("buffer_size", [1, 2, 3, 7, 64 * 1024])
+    def test_buffer_size_does_not_change_ranges(self, identifier, mock_resources_dir, buffer_size):
+        """Test that ranges cut across buffer boundaries are parsed whole."""
+        filename = 'stream.txt'
+        with open(os.path.join(mock_resources_dir, filename), 'w') as f:
+            f.write('11-22,95-115,998-1012\n1188511880-1188511890,222220-222224\n\n')
+        ranges = list(identifier._iterate_ranges_from_txt(filename, buffer_size=buffer_size))
+        assert ranges == [(11, 22), (95, 115), (998, 1012), (1188511880, 1188511890), (222220, 222224)]
+
+    def test_yields_lazily(self, identifier, mock_resources_dir):
+        """Test that ranges are yielded before the rest of the file is parsed."""
+        filename = 'stream.txt'
+        with open(os.path.join(mock_resources_dir, filename), 'w') as f:
+            f.write('1-10,20-30,a-b')
+        ranges = identifier._iterate_ranges_from_txt(filename, buffer_size=4)
+        assert next(ranges) == (1, 10)
+        assert next(ranges) == (20, 30)
+        with pytest.raises(ValueError, match="Invalid range format: a-b, non-numeric values found."):
+            next(ranges)
+
+    def test_trailing_separator_is_an_empty_range(self, identifier, mock_resources_dir):
+        """Test that a trailing comma is reported like any range without separator."""
+        filename = 'stream.txt'
+        with open(os.path.join(mock_resources_dir, filename), 'w') as f:
+            f.write('1-10,')
+        with pytest.raises(ValueError, match="Invalid range format: , missing separator."):
+            list(identifier._iterate_ranges_from_txt(filename))
+
 class TestLeftHalf:
     
     def test_left_half_even_length(self, identifier):
@@ -176,3 +216,150 @@ class TestBreakdownRangeIntoMagnitudes:
         """Test breakdown of range with single value."""
         result = identifier._breakdown_range_into_magnitudes((500, 500))
         assert result == [(500, 500)]
+
+class TestArithmeticRepeatingUnits:
+
+    def test_digits(self, identifier):
+        """Test digit count without string conversion."""
+        assert identifier._digits(0) == 1
+        assert identifier._digits(9) == 1
+        assert identifier._digits(10) == 2
+        assert identifier._digits(999999) == 6
+        assert identifier._digits(10 ** 30) == 31
+
+    def test_first_repeating_unit(self, identifier):
+        """Test the leading repeating unit is cut off arithmetically."""
+        assert identifier._first_repeating_unit(123456, 2) == 123
+        assert identifier._first_repeating_unit(123456, 3) == 12
+        assert identifier._first_repeating_unit(123456, 6) == 1
+
+    def test_generating_invalid_ids(self, identifier):
+        """Test repeating a unit by multiplication."""
+        assert identifier._generating_invalid_ids(12, 2) == 1212
+        assert identifier._generating_invalid_ids(7, 5) == 77777
+        assert identifier._generating_invalid_ids(123, 3) == 123123123
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_generate_invalid_ids_matches_string_reference(self, identifier, seed):
+        """Property: the arithmetic generator matches the string-based reference."""
+        rng = random.Random(seed)
+        for _ in range(200):
+            n_digits = rng.randint(1, 8)
+            start = rng.randint(10 ** (n_digits - 1), 10 ** n_digits - 1)
+            end = rng.randint(start, 10 ** n_digits - 1)
+            for repeating_count in range(2, n_digits + 1):
+                expected = identifier._generate_invalid_ids_in_range_within_same_magnitude_by_strings(start, end, repeating_count)
+                assert identifier.generate_invalid_ids_in_range_within_same_magnitude(start, end, repeating_count) == expected
+
+class TestCountAndSumInvalidIds:
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_count_and_sum_matches_enumeration(self, identifier, seed):
+        """Property: closed-form totals match len() and sum() of the enumerated invalid IDs, overlapping ranges included."""
+        rng = random.Random(seed)
+        ranges = []
+        for _ in range(rng.randint(1, 6)):
+            start = rng.randint(1, 10 ** 6)
+            ranges.append((start, start + rng.randint(0, 10 ** rng.randint(1, 5))))
+        identifier.ranges = ranges
+
+        invalid_ids = identifier.resolve_when_invalid_id_means_repeating_twice()
+        assert identifier.count_and_sum_invalid_ids(ranges, module.REPEATING_TWICE) == (len(invalid_ids), sum(invalid_ids))
+        invalid_ids_part2 = identifier.resolve_when_invalid_id_means_repeating_at_least_twice()
+        assert identifier.count_and_sum_invalid_ids(ranges, module.REPEATING_AT_LEAST_TWICE) == (len(invalid_ids_part2), sum(invalid_ids_part2))
+
+    def test_count_and_sum_counts_each_id_once(self, identifier):
+        """Test that IDs repeating in several ways, like 111111, are counted once."""
+        assert identifier.count_and_sum_invalid_ids([(111111, 111111)], module.REPEATING_AT_LEAST_TWICE) == (1, 111111)
+        assert identifier.count_and_sum_invalid_ids([(100000, 999999)], module.REPEATING_AT_LEAST_TWICE)[0] == 900 + 90 - 9
+
+    def test_count_and_sum_beyond_enumerable_ranges(self, identifier):
+        """Test an 18-digit magnitude holding 10^9 invalid IDs."""
+        count, total = identifier.count_and_sum_invalid_ids([(10 ** 17, 10 ** 18 - 1)], module.REPEATING_TWICE)
+        assert count == 9 * 10 ** 8
+        assert total == (10 ** 9 + 1) * (10 ** 8 + 10 ** 9 - 1) * count // 2
+
+    def test_count_and_sum_unknown_mode(self, identifier):
+        """Test that an unknown mode raises ValueError."""
+        with pytest.raises(ValueError):
+            identifier.count_and_sum_invalid_ids([(1, 10)], 'thrice')
+
+class TestIterateInvalidIdsRepeatingAtLeastTwice:
+
+    def test_yields_sorted_unique_ids(self, identifier):
+        """Test that IDs repeating in several ways are yielded once, in increasing order."""
+        identifier.ranges = [(1, 1200), (100000, 111111)]
+        invalid_ids = list(identifier.iterate_invalid_ids_repeating_at_least_twice())
+        assert invalid_ids[:10] == [11, 22, 33, 44, 55, 66, 77, 88, 99, 111]
+        assert invalid_ids[-2:] == [110110, 111111]
+        assert invalid_ids == sorted(set(invalid_ids))
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_all_repeating_counts(self, identifier, seed):
+        """Property: trying only prime repeat counts finds the same IDs as trying every repeat count."""
+        rng = random.Random(seed)
+        ranges = []
+        for _ in range(rng.randint(1, 6)):
+            start = rng.randint(1, 10 ** 7)
+            ranges.append((start, start + rng.randint(0, 10 ** rng.randint(1, 6))))
+        identifier.ranges = ranges
+
+        expected = set()
+        for repeating_count in range(2, identifier._digits(max(end for _, end in ranges)) + 1):
+            expected.update(identifier.search_invalid_ids_in_ranges(repeating_count))
+        assert list(identifier.iterate_invalid_ids_repeating_at_least_twice()) == sorted(expected)
+
+class TestIdRangeIndex:
+
+    def test_merges_overlapping_duplicate_and_adjacent_ranges(self):
+        """Test that ranges are sorted and merged once."""
+        index = IdRangeIndex([(20, 30), (1, 10), (5, 12), (1, 10), (13, 15), (40, 40)])
+        assert index.merged_ranges == [(1, 15), (20, 30), (40, 40)]
+
+    def test_splits_merged_ranges_by_magnitude(self):
+        """Test that merged ranges are split into same-magnitude sub-ranges."""
+        index = IdRangeIndex([(95, 500), (400, 1050)])
+        assert index.ranges_of_same_magnitude == [(95, 99), (100, 999), (1000, 1050)]
+
+    def test_empty(self):
+        """Test an index without ranges."""
+        index = IdRangeIndex([])
+        assert index.merged_ranges == []
+        assert index.ranges_of_same_magnitude == []
+
+    def test_overlapping_ranges_emit_each_invalid_id_once(self, identifier):
+        """Test that overlapping input ranges are scanned once."""
+        identifier.ranges = [(10, 99), (50, 120), (10, 99)]
+        assert identifier.resolve_when_invalid_id_means_repeating_twice() == [11, 22, 33, 44, 55, 66, 77, 88, 99]
+
+    def test_replacing_ranges_rebuilds_index(self, identifier):
+        """Test that assigning new ranges rebuilds the shared index."""
+        identifier.ranges = [(1000, 1100)]
+        assert identifier.range_index.merged_ranges == [(1000, 1100)]
+
+class TestSearchInvalidIdsInParallel:
+
+    def test_matches_serial_paths(self, identifier):
+        """Test that the parallel search returns the serial results of both parts."""
+        identifier.ranges = [(1, 10 ** 6), (95, 1050), (10 ** 7, 10 ** 7 + 5 * 10 ** 5)]
+
+        part1_ids, part1_reports = identifier.search_invalid_ids_in_parallel(module.REPEATING_TWICE, workers=2)
+        part2_ids, part2_reports = identifier.search_invalid_ids_in_parallel(module.REPEATING_AT_LEAST_TWICE, workers=2)
+
+        assert part1_ids == identifier.resolve_when_invalid_id_means_repeating_twice()
+        assert part2_ids == identifier.resolve_when_invalid_id_means_repeating_at_least_twice()
+        assert len(part1_reports) == 2
+        assert sum(report.n_invalid_ids for report in part1_reports) == len(part1_ids)
+        assert all(report.seconds >= 0 for report in part1_reports + part2_reports)
+
+    def test_balance_splits_oversized_work_units(self, identifier):
+        """Test that one large work unit is split evenly over the workers without losing candidates."""
+        batches = identifier._balance_work_units([(100000, 999999, 2)], workers=4)
+        loads = [sum(len(module._invalid_id_progression(*work_unit)) for work_unit in batch) for batch in batches]
+        assert sum(loads) == 900
+        assert max(loads) - min(loads) <= 1
+
+    def test_unknown_mode(self, identifier):
+        """Test that an unknown mode raises ValueError."""
+        with pytest.raises(ValueError):
+            identifier.search_invalid_ids_in_parallel('thrice', workers=2)
@@ -1,21 +1,124 @@
+import mmap
 import os
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the per-line path is used without it
+    np = None
 
 RESOURCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources')
+INT_CONVERSION_BLOCK_DIGITS = 4000  # Below the default limit of sys.get_int_max_str_digits()
+INT64_SAFE_DIGITS = 18
+STREAM_CHUNK_LINES = 10_000
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+
+class RangeArgmaxIndex:
+    """Sparse table over the digits of a bank, answering leftmost-argmax queries on any window in O(1) after an O(L log L) build.
+    Level k holds, for every start i, the position of the leftmost largest digit in digits[i:i + 2**k]."""
+
+    def __init__(self, digits: bytes):
+        self.digits = digits
+        self.levels = [array('l', range(len(digits)))]
+        span = 1
+        while 2 * span <= len(digits):
+            previous = self.levels[-1]
+            self.levels.append(array('l', (
+                left if digits[left] >= digits[right] else right
+                for left, right in zip(previous, previous[span:])
+            )))
+            span *= 2
+
+    def argmax(self, start: int, end: int) -> int:
+        """Position of the leftmost largest digit in digits[start:end + 1]."""
+        level = (end - start + 1).bit_length() - 1
+        left = self.levels[level][start]
+        right = self.levels[level][end - (1 << level) + 1]
+        return left if self.digits[left] >= self.digits[right] else right
 
 
 class LargestPossibleJoltageResolver:
 
     def __init__(self):
         self.data = None
+        self.range_argmax_indexes: Dict[str, RangeArgmaxIndex] = {}
+        self.digit_matrix = None
+        self._digit_matrix_mmap: Optional[mmap.mmap] = None
 
     def resolve(self, n_digit) -> int:
+        if self.data is None and self.digit_matrix is not None:
+            return self.resolve_digit_matrix(n_digit)
         result = []
         for line in self.data:
             # result.append(self.find_largest_two_digit_number(line))
             result.append(self.find_largest_n_digit_number(line, n_digit))
         return result
+
+    def resolve_batch(self, n_digits: List[int]) -> Dict[int, List[int]]:
+        """Resolve several digit counts in one pass over the data, as {n_digit: resolve(n_digit)}."""
+        if self.data is None and self.digit_matrix is not None:
+            return {n_digit: self.resolve_digit_matrix(n_digit) for n_digit in n_digits}
+        result = {n_digit: [] for n_digit in n_digits}
+        for line in self.data:
+            index = self.range_argmax_indexes.get(line)
+            if index is None:
+                index = self.range_argmax_indexes[line] = RangeArgmaxIndex(line.encode())
+            for n_digit in n_digits:
+                result[n_digit].append(self._find_largest_n_digit_number_with_index(index, n_digit))
+        return result
+
+    def find_largest_n_digit_numbers(self, value_string: str, ns: List[int]) -> List[int]:
+        """Find the largest number for every n in ns, sharing one range-argmax index over the line.
+        Loaded lines reuse the index resolve_batch built for them, other lines get a temporary one."""
+        index = self.range_argmax_indexes.get(value_string) or RangeArgmaxIndex(value_string.encode())
+        return [self._find_largest_n_digit_number_with_index(index, n) for n in ns]
     
-    def find_largest_n_digit_number(self, value_string: str, n: int) -> int:
+    def find_largest_n_digit_number(self, value_string: Union[str, bytes], n: int) -> int:
+        """Greedily keep the largest digits with a monotonic stack, in one pass over the digit bytes.
+        A digit is popped when a larger one follows and enough digits remain to still pick n of them.
+        Lines that resolve_batch already indexed are answered from their range-argmax index instead, in O(n)."""
+        assert len(value_string) >= n, "Value string length must be at least n"
+        index = self.range_argmax_indexes.get(value_string) if isinstance(value_string, str) else None
+        if index is not None:
+            return self._find_largest_n_digit_number_with_index(index, n)
+        digits = value_string.encode() if isinstance(value_string, str) else value_string
+        n_droppable = len(digits) - n
+        stack = bytearray()
+        for digit in digits:
+            while n_droppable and stack and stack[-1] < digit:
+                stack.pop()
+                n_droppable -= 1
+            stack.append(digit)
+        return self._digits_to_int(stack[:n])
+
+    def _find_largest_n_digit_number_with_index(self, index: RangeArgmaxIndex, n: int) -> int:
+        """Pick each digit as the leftmost largest one in the window that still leaves room for the remaining digits."""
+        assert len(index.digits) >= n, "Value string length must be at least n"
+        selected = bytearray()
+        start_index = 0
+        for i in range(n):
+            position = index.argmax(start_index, len(index.digits) - n + i)
+            selected.append(index.digits[position])
+            start_index = position + 1
+        return self._digits_to_int(selected)
+
+    def _digits_to_int(self, digits: bytes) -> int:
+        """Convert ASCII digits to an int, block by block so that long numbers stay under the int conversion limit."""
+        if len(digits) <= INT_CONVERSION_BLOCK_DIGITS:
+            return int(digits)
+        value = 0
+        for block_start in range(0, len(digits), INT_CONVERSION_BLOCK_DIGITS):
+            block = digits[block_start:block_start + INT_CONVERSION_BLOCK_DIGITS]
+            value = value * 10 ** len(block) + int(block)
+        return value
+
+    def _find_largest_n_digit_number_by_rescanning(self, value_string: str, n: int) -> int:
+        """Reference implementation of find_largest_n_digit_number, rescanning the remaining substring for every digit."""
         assert len(value_string) >= n, "Value string length must be at least n"
         positions = []
         start_index = 0
@@ -47,8 +150,111 @@ class LargestPossibleJoltageResolver:
         with open(os.path.join(RESOURCE_DIR, filename), 'r') as file:
             adapters = [line.strip() for line in file.readlines()]
             self.data = adapters
+            self.range_argmax_indexes = {}
+            self.digit_matrix = None
+            self._digit_matrix_mmap = None
+        return self
+
+    def load_digit_matrix(self, filename: str):
+        """Map the file into memory and expose equal-length banks as one read-only (rows x L) uint8 matrix of ASCII digits.
+        The matrix is a strided view over the mapped bytes, so no line is copied. Ragged files, or a missing NumPy,
+        fall back to load_data and per-row handling, leaving digit_matrix as None."""
+        self.data = None
+        self.range_argmax_indexes = {}
+        self.digit_matrix = self._map_digit_matrix(os.path.join(RESOURCE_DIR, filename)) if np is not None else None
+        if self.digit_matrix is None:
+            self.load_data(filename)
         return self
 
+    def _map_digit_matrix(self, filepath: str):
+        """Detect the row stride from the first newline and view the mapped file as a matrix, or return None if the rows are ragged or not all digits."""
+        with open(filepath, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return None
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = np.frombuffer(mapped, dtype=np.uint8)
+        first_newline = mapped.find(b'\n')
+        if first_newline <= 0:
+            return None
+        stride = first_newline + 1
+        row_length = first_newline - 1 if mapped[first_newline - 1:first_newline] == b'\r' else first_newline
+        n_rows = (len(buffer) + stride - row_length) // stride
+        if n_rows * stride not in (len(buffer), len(buffer) + stride - row_length):
+            return None
+        if n_rows * stride == len(buffer) and mapped[len(buffer) - (stride - row_length):] != mapped[row_length:stride]:
+            return None  # the last row is longer by a terminator's length, rather than terminated
+        separators = np.lib.stride_tricks.as_strided(buffer[row_length:], shape=(n_rows - 1, stride - row_length), strides=(stride, 1))
+        if not (separators == buffer[row_length:stride]).all():
+            return None
+        matrix = np.lib.stride_tricks.as_strided(buffer, shape=(n_rows, row_length), strides=(stride, 1))
+        if not ((matrix >= ord('0')) & (matrix <= ord('9'))).all():
+            return None
+        self._digit_matrix_mmap = mapped
+        matrix.flags.writeable = False
+        return matrix
+
+    def resolve_digit_matrix(self, n_digit: int) -> List[int]:
+        """Resolve all banks of the digit matrix at once, like resolve(n_digit).
+        Each digit is a vectorized argmax per row over the window that still leaves room for the remaining digits,
+        with the columns before each row's previous pick masked out. argmax returns the leftmost maximum, as the greedy requires."""
+        if self.digit_matrix is None:
+            return self.resolve(n_digit)
+        matrix = self.digit_matrix
+        n_rows, row_length = matrix.shape
+        assert row_length >= n_digit, "Value string length must be at least n"
+        rows = np.arange(n_rows)
+        start_indexes = np.zeros(n_rows, dtype=np.int64)
+        selected = np.empty((n_rows, n_digit), dtype=np.uint8)
+        for i in range(n_digit):
+            window_start = int(start_indexes.min())
+            window_end = row_length - n_digit + i + 1
+            window = matrix[:, window_start:window_end]
+            before_start = np.arange(window_start, window_end) < start_indexes[:, None]
+            positions = np.where(before_start, 0, window).argmax(axis=1) + window_start
+            selected[:, i] = matrix[rows, positions]
+            start_indexes = positions + 1
+        if n_digit <= INT64_SAFE_DIGITS:
+            place_values = 10 ** np.arange(n_digit - 1, -1, -1, dtype=np.int64)
+            return ((selected - ord('0')).astype(np.int64) @ place_values).tolist()
+        return [self._digits_to_int(row.tobytes()) for row in selected]
+
+    def resolve_stream(self, filename: str, n_digit: int, workers: int = 1, chunk_lines: int = STREAM_CHUNK_LINES) -> int:
+        """Sum the largest n_digit numbers of all lines without loading the file, solving chunks of lines in worker processes."""
+        return sum(self._iterate_solved_chunks(filename, n_digit, workers, chunk_lines, per_line=False))
+
+    def iterate_stream(self, filename: str, n_digit: int, workers: int = 1, chunk_lines: int = STREAM_CHUNK_LINES) -> Iterator[Tuple[int, int]]:
+        """Lazily yield (answer, running_sum) for every line, in file order, like resolve_stream."""
+        running_sum = 0
+        for answers in self._iterate_solved_chunks(filename, n_digit, workers, chunk_lines, per_line=True):
+            for answer in answers:
+                running_sum += answer
+                yield answer, running_sum
+
+    def _iterate_solved_chunks(self, filename: str, n_digit: int, workers: int, chunk_lines: int, per_line: bool) -> Iterator[Union[int, List[int]]]:
+        """Read the file chunk_lines lines at a time and yield each chunk's sum, or its answers if per_line, in file order.
+        At most CHUNKS_IN_FLIGHT_PER_WORKER chunks per worker are read ahead, so memory stays bounded whatever the file size."""
+        with open(os.path.join(RESOURCE_DIR, filename), 'r') as file:
+            chunks = iter(lambda: [line.strip() for line in islice(file, chunk_lines)], [])
+            if workers <= 1:
+                for chunk in chunks:
+                    yield _solve_chunk(chunk, n_digit, per_line)
+                return
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                in_flight = deque()
+                for chunk in chunks:
+                    in_flight.append(executor.submit(_solve_chunk, chunk, n_digit, per_line))
+                    if len(in_flight) >= workers * CHUNKS_IN_FLIGHT_PER_WORKER:
+                        yield in_flight.popleft().result()
+                while in_flight:
+                    yield in_flight.popleft().result()
+
+def _solve_chunk(lines: List[str], n_digit: int, per_line: bool) -> Union[int, List[int]]:
+    """Solve a chunk of lines in a worker, returning only their sum unless per-line answers are requested."""
+    resolver = LargestPossibleJoltageResolver()
+    answers = [resolver.find_largest_n_digit_number(line, n_digit) for line in lines]
+    return answers if per_line else sum(answers)
+
+
 if __name__ == "__main__":
     puzzle_input_filename = "puzzle_input_sample.txt"
     resolver = LargestPossibleJoltageResolver()
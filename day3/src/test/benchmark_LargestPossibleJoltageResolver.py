@@ -0,0 +1,91 @@
+import os
+import random
+import tempfile
+import time
+from day3.src.main.python.LargestPossibleJoltageResolver import LargestPossibleJoltageResolver, RangeArgmaxIndex
+
+
+def _random_bank(length: int, seed: int = 42) -> str:
+    rng = random.Random(seed)
+    return ''.join(rng.choice('123456789') for _ in range(length))
+
+
+def _time(fn) -> tuple:
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def benchmark_monotonic_stack_against_rescanning():
+    """Compare the one-pass monotonic stack with the rescanning reference, then run it alone on 10^6-digit banks."""
+    print("======Monotonic stack vs rescanning======")
+    resolver = LargestPossibleJoltageResolver()
+    for length, n in [(10_000, 100), (10_000, 1000)]:
+        bank = _random_bank(length)
+        stack_answer, stack_seconds = _time(lambda: resolver.find_largest_n_digit_number(bank, n))
+        rescanning_answer, rescanning_seconds = _time(lambda: resolver._find_largest_n_digit_number_by_rescanning(bank, n))
+        assert stack_answer == rescanning_answer
+        print(f"L={length}, n={n}: monotonic stack {stack_seconds:.4f}s, rescanning {rescanning_seconds:.4f}s")
+    for length, n in [(1_000_000, 1000), (1_000_000, 5000)]:
+        bank = _random_bank(length)
+        _, stack_seconds = _time(lambda: resolver.find_largest_n_digit_number(bank, n))
+        print(f"L={length}, n={n}: monotonic stack {stack_seconds:.4f}s")
+
+
+def benchmark_range_argmax_index_for_many_n():
+    """Compare answering many digit counts from one range-argmax index with a monotonic-stack pass per count."""
+    print("======Range-argmax index vs monotonic stack for many n======")
+    resolver = LargestPossibleJoltageResolver()
+    bank = _random_bank(100_000)
+    ns = list(range(1, 201))
+    index, build_seconds = _time(lambda: RangeArgmaxIndex(bank.encode()))
+    resolver.range_argmax_indexes = {bank: index}
+    indexed_answers, indexed_seconds = _time(lambda: resolver.find_largest_n_digit_numbers(bank, ns))
+    resolver.range_argmax_indexes = {}
+    stack_answers, stack_seconds = _time(lambda: [resolver.find_largest_n_digit_number(bank, n) for n in ns])
+    assert indexed_answers == stack_answers
+    print(f"L={len(bank)}, {len(ns)} values of n: index build {build_seconds:.4f}s + queries {indexed_seconds:.4f}s, monotonic stack {stack_seconds:.4f}s")
+
+
+def benchmark_digit_matrix_against_per_line(n_rows: int = 100_000, row_length: int = 100):
+    """Compare the memory-mapped digit matrix and batched NumPy solver with loading and resolving line by line."""
+    print("======Digit matrix vs per-line resolve======")
+    rng = random.Random(42)
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as file:
+        file.write('\n'.join(''.join(rng.choice('123456789') for _ in range(row_length)) for _ in range(n_rows)))
+    for n_digit in [2, 12]:
+        matrix_resolver = LargestPossibleJoltageResolver()
+        _, matrix_load_seconds = _time(lambda: matrix_resolver.load_digit_matrix(file.name))
+        matrix_answers, matrix_seconds = _time(lambda: matrix_resolver.resolve_digit_matrix(n_digit))
+        line_resolver = LargestPossibleJoltageResolver()
+        _, line_load_seconds = _time(lambda: line_resolver.load_data(file.name))
+        line_answers, line_seconds = _time(lambda: line_resolver.resolve(n_digit))
+        assert matrix_answers == line_answers
+        print(f"{n_rows}x{row_length}, n={n_digit}: digit matrix load {matrix_load_seconds:.4f}s + solve {matrix_seconds:.4f}s, "
+              f"per line load {line_load_seconds:.4f}s + solve {line_seconds:.4f}s")
+    os.remove(file.name)
+
+
+def benchmark_resolve_stream_scaling(n_rows: int = 200_000, row_length: int = 100):
+    """Measure streaming throughput of resolve_stream as the number of worker processes grows."""
+    print("======Streaming resolve scaling======")
+    rng = random.Random(42)
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as file:
+        file.write('\n'.join(''.join(rng.choice('123456789') for _ in range(row_length)) for _ in range(n_rows)))
+    resolver = LargestPossibleJoltageResolver()
+    expected, baseline_seconds = _time(lambda: resolver.resolve_stream(file.name, 12))
+    print(f"{n_rows} lines: 1 worker {baseline_seconds:.4f}s ({n_rows / baseline_seconds:.0f} lines/s)")
+    workers = 2
+    while workers <= (os.cpu_count() or 1) * 2:
+        total, seconds = _time(lambda: resolver.resolve_stream(file.name, 12, workers=workers))
+        assert total == expected
+        print(f"{workers} workers: {seconds:.4f}s ({n_rows / seconds:.0f} lines/s)")
+        workers *= 2
+    os.remove(file.name)
+
+
+if __name__ == "__main__":
+    benchmark_monotonic_stack_against_rescanning()
+    benchmark_range_argmax_index_for_many_n()
+    benchmark_digit_matrix_against_per_line()
+    benchmark_resolve_stream_scaling()
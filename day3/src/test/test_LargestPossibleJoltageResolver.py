@@ -1,6 +1,8 @@
 import pytest
+import random
 from unittest.mock import mock_open, patch
-from day3.src.main.python.LargestPossibleJoltageResolver import LargestPossibleJoltageResolver
+from day3.src.main.python.LargestPossibleJoltageResolver import LargestPossibleJoltageResolver, RangeArgmaxIndex
+import day3.src.main.python.LargestPossibleJoltageResolver as module
 
 class TestLargestPossibleJoltageResolver:
     
@@ -28,4 +30,173 @@ class TestLargestPossibleJoltageResolver:
         resolver = LargestPossibleJoltageResolver()
         resolver.load_data("dummy.txt")
         result = resolver.resolve(2)
-        assert result == [56, 98]
\ No newline at end of file
+        assert result == [56, 98]
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_find_largest_n_digit_number_matches_rescanning_reference(self, seed):
+        resolver = LargestPossibleJoltageResolver()
+        rng = random.Random(seed)
+        for _ in range(200):
+            value_string = ''.join(rng.choice('123456789') for _ in range(rng.randint(1, 60)))
+            n = rng.randint(1, len(value_string))
+            expected = resolver._find_largest_n_digit_number_by_rescanning(value_string, n)
+            assert resolver.find_largest_n_digit_number(value_string, n) == expected
+            assert resolver.find_largest_n_digit_number(value_string.encode(), n) == expected
+
+    def test_find_largest_n_digit_number_beyond_int_conversion_limit(self):
+        resolver = LargestPossibleJoltageResolver()
+        value_string = '9' * 10000 + '1'
+        assert resolver.find_largest_n_digit_number(value_string, 10000) == 10 ** 10000 - 1
+
+    def test_range_argmax_index_picks_leftmost_largest(self):
+        index = RangeArgmaxIndex(b"3919429")
+        assert index.argmax(0, 6) == 1
+        assert index.argmax(2, 6) == 3
+        assert index.argmax(4, 5) == 4
+        assert index.argmax(5, 6) == 6
+        assert index.argmax(0, 0) == 0
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_range_argmax_index_matches_linear_scan(self, seed):
+        rng = random.Random(seed)
+        digits = ''.join(rng.choice('0123456789') for _ in range(100))
+        index = RangeArgmaxIndex(digits.encode())
+        for _ in range(300):
+            start = rng.randint(0, 99)
+            end = rng.randint(start, 99)
+            window = digits[start:end + 1]
+            assert index.argmax(start, end) == start + window.index(max(window))
+
+    @patch("builtins.open", new_callable=mock_open, read_data="987654321111111\n811111111111119\n234234234234278\n818181911112111\n")
+    def test_range_argmax_indexes_are_built_on_first_batch(self, mock_file):
+        resolver = LargestPossibleJoltageResolver()
+        resolver.load_data("dummy.txt")
+        assert resolver.range_argmax_indexes == {}
+        resolver.resolve(12)
+        assert resolver.range_argmax_indexes == {}
+        resolver.find_largest_n_digit_numbers("123456789", [1, 2])
+        assert resolver.range_argmax_indexes == {}
+        ns = list(range(1, 16))
+        result = resolver.resolve_batch(ns)
+        assert set(resolver.range_argmax_indexes) == set(resolver.data)
+        for line_number, line in enumerate(resolver.data):
+            for n in ns:
+                assert result[n][line_number] == resolver._find_largest_n_digit_number_by_rescanning(line, n)
+
+    @patch("builtins.open", new_callable=mock_open, read_data="987654321111111\n811111111111119\n")
+    def test_single_n_reuses_a_cached_index(self, mock_file):
+        resolver = LargestPossibleJoltageResolver()
+        resolver.load_data("dummy.txt")
+        expected = resolver.resolve(12)
+        resolver.resolve_batch([2])
+        with patch.object(resolver, "_find_largest_n_digit_number_with_index", wraps=resolver._find_largest_n_digit_number_with_index) as with_index:
+            assert resolver.resolve(12) == expected
+            assert with_index.call_count == len(resolver.data)
+
+    @patch("builtins.open", new_callable=mock_open, read_data="987654321111111\n811111111111119\n234234234234278\n818181911112111\n")
+    def test_resolve_batch(self, mock_file):
+        resolver = LargestPossibleJoltageResolver()
+        resolver.load_data("dummy.txt")
+        result = resolver.resolve_batch([2, 12])
+        assert result == {2: resolver.resolve(2), 12: resolver.resolve(12)}
+        assert result[2] == [98, 89, 78, 92]
+
+
+class TestDigitMatrix:
+
+    @pytest.fixture
+    def resource_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(module, "RESOURCE_DIR", str(tmp_path))
+        return tmp_path
+
+    @pytest.mark.parametrize("content", [
+        "987654321111111\n811111111111119\n234234234234278\n818181911112111\n",
+        "987654321111111\n811111111111119\n234234234234278\n818181911112111",
+        "987654321111111\r\n811111111111119\r\n234234234234278\r\n818181911112111\r\n",
+    ])
+    def test_equal_length_banks_are_mapped_into_a_matrix(self, resource_dir, content):
+        pytest.importorskip("numpy")
+        (resource_dir / "banks.txt").write_bytes(content.encode())
+        resolver = LargestPossibleJoltageResolver().load_digit_matrix("banks.txt")
+        assert resolver.digit_matrix.shape == (4, 15)
+        assert resolver.digit_matrix.flags.writeable is False
+        assert resolver.data is None
+        assert resolver.resolve_digit_matrix(2) == [98, 89, 78, 92]
+        assert resolver.resolve_digit_matrix(12) == [987654321111, 811111111119, 434234234278, 888911112111]
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_resolve_digit_matrix_matches_resolve(self, resource_dir, seed):
+        pytest.importorskip("numpy")
+        rng = random.Random(seed)
+        lines = [''.join(rng.choice('123456789') for _ in range(40)) for _ in range(30)]
+        (resource_dir / "banks.txt").write_text('\n'.join(lines) + '\n')
+        resolver = LargestPossibleJoltageResolver().load_digit_matrix("banks.txt")
+        for n in [1, 2, 12, 19, 40]:
+            assert resolver.resolve_digit_matrix(n) == [resolver.find_largest_n_digit_number(line, n) for line in lines]
+
+    def test_ragged_banks_fall_back_to_per_row(self, resource_dir):
+        (resource_dir / "banks.txt").write_text("987654321111111\n81111111119\n234234234234278\n")
+        resolver = LargestPossibleJoltageResolver().load_digit_matrix("banks.txt")
+        assert resolver.digit_matrix is None
+        assert resolver.data == ["987654321111111", "81111111119", "234234234234278"]
+        assert resolver.resolve_digit_matrix(2) == [98, 89, 78]
+        # An unterminated last bank longer by a terminator's length is ragged too
+        for content in (b"987\n1119", b"987\r\n11119"):
+            (resource_dir / "banks.txt").write_bytes(content)
+            resolver = LargestPossibleJoltageResolver().load_digit_matrix("banks.txt")
+            assert resolver.digit_matrix is None
+            assert resolver.resolve_digit_matrix(2) == [98, 19]
+
+    def test_loading_either_way_replaces_the_previous_file(self, resource_dir):
+        pytest.importorskip("numpy")
+        (resource_dir / "a.txt").write_text("12\n34\n")
+        (resource_dir / "b.txt").write_text("98\n76\n")
+        resolver = LargestPossibleJoltageResolver()
+        resolver.load_digit_matrix("a.txt")
+        assert resolver.resolve(2) == resolver.resolve_digit_matrix(2) == [12, 34]
+        assert resolver.resolve_batch([1, 2]) == {1: [2, 4], 2: [12, 34]}
+        resolver.load_data("b.txt")
+        assert resolver.digit_matrix is None
+        assert resolver.resolve(2) == resolver.resolve_digit_matrix(2) == [98, 76]
+        resolver.load_digit_matrix("a.txt")
+        assert resolver.resolve(2) == resolver.resolve_digit_matrix(2) == [12, 34]
+
+    def test_missing_numpy_falls_back_to_per_row(self, resource_dir, monkeypatch):
+        monkeypatch.setattr(module, "np", None)
+        (resource_dir / "banks.txt").write_text("987654321111111\n811111111111119\n")
+        resolver = LargestPossibleJoltageResolver().load_digit_matrix("banks.txt")
+        assert resolver.digit_matrix is None
+        assert resolver.resolve_digit_matrix(2) == [98, 89]
+
+
+class TestResolveStream:
+
+    @pytest.fixture
+    def banks_file(self, tmp_path):
+        rng = random.Random(0)
+        lines = [''.join(rng.choice('123456789') for _ in range(30)) for _ in range(103)]
+        banks_file = tmp_path / "banks.txt"
+        banks_file.write_text('\n'.join(lines) + '\n')
+        return str(banks_file), lines
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_resolve_stream_matches_resolve(self, banks_file, workers):
+        filepath, lines = banks_file
+        resolver = LargestPossibleJoltageResolver()
+        expected = sum(resolver.find_largest_n_digit_number(line, 12) for line in lines)
+        assert resolver.resolve_stream(filepath, 12, workers=workers, chunk_lines=10) == expected
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_iterate_stream_yields_answers_and_running_sum_in_order(self, banks_file, workers):
+        filepath, lines = banks_file
+        resolver = LargestPossibleJoltageResolver()
+        expected_answers = [resolver.find_largest_n_digit_number(line, 2) for line in lines]
+        streamed = list(resolver.iterate_stream(filepath, 2, workers=workers, chunk_lines=7))
+        assert [answer for answer, _ in streamed] == expected_answers
+        assert [running_sum for _, running_sum in streamed][-1] == sum(expected_answers)
+        assert streamed[1][1] == expected_answers[0] + expected_answers[1]
+
+    def test_resolve_stream_empty_file(self, tmp_path):
+        empty_file = tmp_path / "empty.txt"
+        empty_file.write_text("")
+        assert LargestPossibleJoltageResolver().resolve_stream(str(empty_file), 2, workers=2) == 0
@@ -1,9 +1,22 @@
+import mmap
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from enum import Enum
 from copy import deepcopy
-from typing import List
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterator, List, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only the numpy backend needs it
+    np = None
 
 RESOURCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources')
+BACKENDS = ('list', 'packed', 'numpy')
+MMAP_SCAN_BLOCK_BYTES = 1 << 22
+NEIGHBOUR_OFFSETS = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
 
 class Symbol(str, Enum):
     FORKLIFT_ACCESSIBLE_PAPER_ROLL = 'x'
@@ -11,14 +24,291 @@ class Symbol(str, Enum):
     SPACE = '.'
 
 
+_SYMBOL_BY_CODE = {ord(symbol.value): symbol for symbol in Symbol}
+_CODES = ''.join(symbol.value for symbol in Symbol).encode()
+_PAPER_ROLL_TO_BIT = bytes.maketrans(_CODES, b''.join(b'1' if symbol == Symbol.PAPER_ROLL else b'0' for symbol in Symbol))
+_ROLL_FLAGS = {Symbol.FORKLIFT_ACCESSIBLE_PAPER_ROLL: 2, Symbol.PAPER_ROLL: 1, Symbol.SPACE: 0}
+_SYMBOL_TO_ROLL_FLAG = bytes.maketrans(_CODES, bytes(_ROLL_FLAGS[symbol] for symbol in Symbol))
+_TRAILING_BLANKS = re.compile(rb'[ \t]+(?=\r?\n|\Z)')
+_PAPER_ROLL_TO_ACCESSIBLE_DELTA = ord(Symbol.FORKLIFT_ACCESSIBLE_PAPER_ROLL.value) - ord(Symbol.PAPER_ROLL.value)
+
+
+class PackedBoardRow:
+    """View of one row of a PackedBoard, behaving like a list of Symbol."""
+
+    def __init__(self, board: 'PackedBoard', row: int):
+        self._cells = board.cells
+        self._offset = row * board.n_cols
+        self._n_cols = board.n_cols
+
+    def __len__(self) -> int:
+        return self._n_cols
+
+    def __getitem__(self, col: int) -> Symbol:
+        return _SYMBOL_BY_CODE[self._cells[self._offset + col]]
+
+    def __setitem__(self, col: int, symbol: Symbol):
+        self._cells[self._offset + col] = ord(symbol.value)
+
+    def __iter__(self) -> Iterator[Symbol]:
+        return (_SYMBOL_BY_CODE[code] for code in self.tobytes())
+
+    def count(self, symbol: Symbol) -> int:
+        return self._cells.count(ord(symbol.value), self._offset, self._offset + self._n_cols)
+
+    def tobytes(self) -> bytes:
+        return bytes(self._cells[self._offset:self._offset + self._n_cols])
+
+
+class PackedBoard:
+    """Board stored row-major as one byte per cell, the ASCII code of its symbol.
+    Rows are PackedBoardRow views, so code written against List[List[Symbol]] keeps working."""
+
+    def __init__(self, cells: bytearray, n_rows: int, n_cols: int):
+        self.cells = cells
+        self.n_rows = n_rows
+        self.n_cols = n_cols
+
+    @classmethod
+    def from_file(cls, filepath: str) -> 'PackedBoard':
+        """Load a board straight from the file bytes, without a Python object per cell."""
+        with MappedBoard.open(filepath) as mapped:
+            return cls(bytearray(mapped.tobytes()), mapped.n_rows, mapped.n_cols)
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def __getitem__(self, row: int) -> PackedBoardRow:
+        if not 0 <= row < self.n_rows:
+            raise IndexError("board row out of range")
+        return PackedBoardRow(self, row)
+
+    def __iter__(self) -> Iterator[PackedBoardRow]:
+        return (PackedBoardRow(self, row) for row in range(self.n_rows))
+
+    def __deepcopy__(self, memo) -> 'PackedBoard':
+        return PackedBoard(bytearray(self.cells), self.n_rows, self.n_cols)
+
+    def count(self, symbol: Symbol) -> int:
+        return self.cells.count(ord(symbol.value))
+
+    def as_array(self):
+        """Zero-copy (n_rows, n_cols) NumPy view of the cell codes. Writes go through to the board."""
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.n_rows, self.n_cols)
+
+    def paper_roll_bitmasks(self) -> List[int]:
+        """One int per row, whose set bits are the paper rolls of the row."""
+        bits = self.cells.translate(_PAPER_ROLL_TO_BIT)
+        return [int(bits[offset:offset + self.n_cols] or b'0', 2) for offset in range(0, len(bits), self.n_cols)] if self.n_cols else []
+
+
+class MappedBoard:
+    """Read-only board mapped straight from its file. Rows are found by their stride, the row width plus its line terminator,
+    so the cells are never copied: rows are memoryview slices of the mapping, and as_array is a strided NumPy view of it.
+    The file is validated in bulk when opened, reporting the row and column of the first invalid symbol or misplaced line break.
+    Trailing spaces and tabs on a line are ignored: such files are copied once with the blanks dropped, and mapped otherwise."""
+
+    def __init__(self, mapping: Union[mmap.mmap, bytes], n_rows: int, n_cols: int, stride: int):
+        self._mapping = mapping
+        self._view = memoryview(mapping)
+        self.n_rows = n_rows
+        self.n_cols = n_cols
+        self.stride = stride
+
+    @classmethod
+    def open(cls, filepath: str) -> 'MappedBoard':
+        with open(filepath, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return cls(b'', 0, 0, 1)
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapping.find(b' ') != -1 or mapping.find(b'\t') != -1:
+            data = _TRAILING_BLANKS.sub(b'', mapping)
+            mapping.close()
+            mapping = data
+        try:
+            n_rows, n_cols, stride = cls._detect_layout(mapping)
+        except ValueError:
+            if isinstance(mapping, mmap.mmap):
+                mapping.close()
+            raise
+        return cls(mapping, n_rows, n_cols, stride)
+
+    @staticmethod
+    def _detect_layout(mapping: Union[mmap.mmap, bytes]) -> Tuple[int, int, int]:
+        """Detect the row width and stride from the first line, then check every block of rows against them."""
+        end = len(mapping)
+        while end > 0 and mapping[end - 1] in b'\r\n':
+            end -= 1
+        first_newline = mapping.find(b'\n', 0, end)
+        if first_newline == -1:
+            first_newline = end
+        terminator = b'\r\n' if first_newline > 0 and mapping[first_newline - 1] == ord('\r') else b'\n'
+        n_cols = first_newline + 1 - len(terminator)
+        stride = n_cols + len(terminator)
+        n_rows = -(-end // stride) if end else 0
+        rows_per_block = max(1, MMAP_SCAN_BLOCK_BYTES // stride)
+        for first_row in range(0, n_rows, rows_per_block):
+            start = first_row * stride
+            block = mapping[start:min(end, start + rows_per_block * stride)]
+            n_terminators = -(-len(block) // stride) - (start + len(block) == end)
+            expected_terminators = terminator[:1] * n_terminators
+            if (block[n_cols::stride][:n_terminators] != expected_terminators or block.count(b'\n') != n_terminators
+                    or (len(terminator) == 2 and block[n_cols + 1::stride][:n_terminators] != b'\n' * n_terminators)
+                    or (start + len(block) == end and len(block) % stride != n_cols)):
+                row, n_cells = MappedBoard._find_ragged_row(mapping[:end], n_cols, terminator)
+                raise ValueError(f"Row {row} has {n_cells} cells, expected {n_cols}.")
+            invalid = block.translate(None, _CODES + terminator)
+            if invalid:
+                position = start + min(block.find(bytes([code])) for code in set(invalid))
+                row, col = divmod(position, stride)
+                raise ValueError(f"'{chr(mapping[position])}' is not a valid {Symbol.__name__}, found on row {row}, column {col}.")
+        return n_rows, n_cols, stride
+
+    @staticmethod
+    def _find_ragged_row(data: bytes, n_cols: int, terminator: bytes) -> Tuple[int, int]:
+        for row, line in enumerate(data.split(terminator)):
+            if len(line) != n_cols:
+                return row, len(line)
+        raise AssertionError("No ragged row found")
+
+    def __enter__(self) -> 'MappedBoard':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Unmap the file. Row views and arrays handed out must be released first."""
+        self._view.release()
+        if isinstance(self._mapping, mmap.mmap):
+            self._mapping.close()
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def __getitem__(self, row: int) -> memoryview:
+        """Read-only view of the cell codes of a row."""
+        if not 0 <= row < self.n_rows:
+            raise IndexError("board row out of range")
+        return self._view[row * self.stride:row * self.stride + self.n_cols]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        return (self[row] for row in range(self.n_rows))
+
+    def tobytes(self) -> bytes:
+        """The cell codes row-major, with the line terminators dropped in one bulk translate."""
+        return self._mapping[:self.n_rows * self.stride].translate(None, b'\r\n')
+
+    def as_array(self):
+        """Zero-copy, read-only (n_rows, n_cols) NumPy view of the cell codes, skipping the line terminators."""
+        size = max(0, self.n_rows * self.stride - (self.stride - self.n_cols))
+        cells = np.frombuffer(self._view[:size], dtype=np.uint8)
+        return np.lib.stride_tricks.as_strided(cells, shape=(self.n_rows, self.n_cols), strides=(self.stride, 1), writeable=False)
+
+
+Board = Union[List[List[Symbol]], PackedBoard]
+
+
 class ForkliftAccessiblePaperRollLocater:
     """Class to locate forklift-accessible paper rolls based on their IDs."""
     
-    def __init__(self):
+    def __init__(self, backend: str = 'list'):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend}, expected one of {BACKENDS}")
+        if backend == 'numpy' and np is None:
+            raise ImportError("The numpy backend requires NumPy to be installed.")
+        self.backend = backend
         self.board = None
 
-    def iteratively_remove_forklift_accessible_paper_rolls(self):
-        """Iteratively remove forklift-accessible paper rolls until none remain."""
+    def iteratively_remove_forklift_accessible_paper_rolls(self, workers: int = 1) -> List[int]:
+        """Iteratively remove forklift-accessible paper rolls until none remain, and return the number removed in each wave.
+        Peels the board like a k-core decomposition: neighbour counts are kept up to date, only the neighbours of removed rolls
+        are decremented, and a roll joins the next wave when its count drops below 4. Each cell is scored and removed once.
+        With more than one worker, the board is peeled in row stripes by worker processes, see _iteratively_remove_forklift_accessible_paper_rolls_in_parallel."""
+        if workers > 1:
+            return self._iteratively_remove_forklift_accessible_paper_rolls_in_parallel(workers)
+        flags, width = self._padded_roll_flags()
+        offsets = _neighbour_position_offsets(width)
+        positions = [position for position, flag in enumerate(flags) if flag]
+        scores = bytearray(len(flags))
+        for position in positions:
+            for offset in offsets:
+                scores[position + offset] += 1
+        # Rolls already marked accessible are removed in the first wave, like the rescanning loop does
+        wave = [position for position in positions if flags[position] == 2 or self._is_forklift_accessible(scores[position])]
+        waves = []
+        while wave:
+            waves.append(len(wave))
+            self._clear_padded_positions(wave, width)
+            for position in wave:
+                flags[position] = 0
+            next_wave = []
+            for position in wave:
+                for offset in offsets:
+                    neighbour = position + offset
+                    if flags[neighbour]:
+                        scores[neighbour] -= 1
+                        if scores[neighbour] == 3:
+                            next_wave.append(neighbour)
+            wave = next_wave
+        return waves
+
+    def _iteratively_remove_forklift_accessible_paper_rolls_in_parallel(self, workers: int) -> List[int]:
+        """Same as iteratively_remove_forklift_accessible_paper_rolls, with the board split into one row stripe per worker.
+        The padded flags and scores live in shared memory, so only removed positions travel between processes.
+        Each worker owns the scores of its stripe: it reads one halo row on each side to score it, and between waves
+        it receives the removals of the boundary rows of its neighbour stripes along with its own."""
+        flags, width = self._padded_roll_flags()
+        n_cells = len(flags)
+        n_rows = len(self.board)
+        n_stripes = max(1, min(workers, n_rows))
+        stripe_rows = [1 + n_rows * stripe // n_stripes for stripe in range(n_stripes + 1)]
+        stripes = list(zip(stripe_rows[:-1], stripe_rows[1:]))
+        shared_memory = SharedMemory(create=True, size=2 * n_cells or 1)
+        try:
+            shared_memory.buf[:n_cells] = flags
+            names = [shared_memory.name] * n_stripes
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                stripe_waves = list(executor.map(_score_stripe, names, [n_cells] * n_stripes, [width] * n_stripes, *zip(*stripes)))
+                waves = []
+                while any(stripe_waves):
+                    waves.append(sum(len(wave) for wave in stripe_waves))
+                    for wave in stripe_waves:
+                        self._clear_padded_positions(wave, width)
+                    removed = []
+                    for stripe, (first_row, end_row) in enumerate(stripes):
+                        above = stripe_waves[stripe - 1] if stripe > 0 else []
+                        below = stripe_waves[stripe + 1] if stripe + 1 < n_stripes else []
+                        halo = [position for position in above if position >= (first_row - 1) * width]
+                        halo += [position for position in below if position < (end_row + 1) * width]
+                        removed.append(stripe_waves[stripe] + halo)
+                    stripe_waves = list(executor.map(_peel_stripe, names, [n_cells] * n_stripes, [width] * n_stripes, *zip(*stripes), stripe_waves, removed))
+        finally:
+            shared_memory.close()
+            shared_memory.unlink()
+        return waves
+
+    def _padded_roll_flags(self) -> Tuple[bytearray, int]:
+        """Flatten the board into one byte per cell: 0 for a space, 1 for a paper roll and 2 for a roll marked accessible.
+        The board is padded with one space on each side, so neighbours never need bounds checks. Returns the flags and the padded row width."""
+        rows = len(self.board)
+        cols = len(self.board[0]) if rows > 0 else 0
+        width = cols + 2
+        flags = bytearray(width * (rows + 2))
+        for r, row in enumerate(self.board):
+            row_bytes = row.tobytes() if isinstance(row, PackedBoardRow) else ''.join(symbol.value for symbol in row).encode()
+            offset = (r + 1) * width + 1
+            flags[offset:offset + cols] = row_bytes.translate(_SYMBOL_TO_ROLL_FLAG)
+        return flags, width
+
+    def _clear_padded_positions(self, positions: List[int], width: int):
+        """Replace the rolls at the given positions of the padded board with spaces."""
+        for position in positions:
+            r, c = divmod(position, width)
+            self.board[r - 1][c - 1] = Symbol.SPACE
+
+    def _iteratively_remove_forklift_accessible_paper_rolls_by_rescanning(self):
+        """Reference implementation of iteratively_remove_forklift_accessible_paper_rolls, relocating on the whole board after each removal."""
         while True:
             result_board = self.locate_forklift_accessible_paper_rolls()
             n_forklift_accessible_paper_rolls = self.count_forklift_accessible_paper_rolls(result_board)
@@ -28,13 +318,19 @@ class ForkliftAccessiblePaperRollLocater:
             self.remove_forklift_accessible_paper_rolls(inplace=True)
 
     def count_paper_rolls(self):
+        if isinstance(self.board, PackedBoard):
+            return self.board.count(Symbol.PAPER_ROLL) + self.board.count(Symbol.FORKLIFT_ACCESSIBLE_PAPER_ROLL)
         return sum(row.count(Symbol.PAPER_ROLL) for row in self.board) + sum(row.count(Symbol.FORKLIFT_ACCESSIBLE_PAPER_ROLL) for row in self.board)
     
     def count_forklift_accessible_paper_rolls(self, result_board):
+        if isinstance(result_board, PackedBoard):
+            return result_board.count(Symbol.FORKLIFT_ACCESSIBLE_PAPER_ROLL)
         return sum(row.count(Symbol.FORKLIFT_ACCESSIBLE_PAPER_ROLL) for row in result_board)
 
     def remove_forklift_accessible_paper_rolls(self, inplace: bool = True):
         """Remove forklift-accessible paper rolls from the board."""
+        if isinstance(self.board, PackedBoard):
+            return self._remove_forklift_accessible_paper_rolls_packed(inplace)
         rows = len(self.board)
         cols = len(self.board[0]) if rows > 0 else 0
         if inplace:
@@ -51,8 +347,24 @@ class ForkliftAccessiblePaperRollLocater:
                         new_board[r][c] = Symbol.SPACE
             return new_board
 
+    def _remove_forklift_accessible_paper_rolls_packed(self, inplace: bool):
+        """Same as remove_forklift_accessible_paper_rolls, with byte searches over the packed cells."""
+        accessible_code = ord(Symbol.FORKLIFT_ACCESSIBLE_PAPER_ROLL.value)
+        if inplace:
+            position = self.board.cells.find(accessible_code)
+            if position != -1:
+                self.board.cells[position] = ord(Symbol.SPACE.value)
+            return self.board
+        new_board = deepcopy(self.board)
+        new_board.cells = new_board.cells.replace(Symbol.FORKLIFT_ACCESSIBLE_PAPER_ROLL.value.encode(), Symbol.SPACE.value.encode())
+        return new_board
+
     def locate_forklift_accessible_paper_rolls(self):
         """Locate forklift-accessible paper rolls in the board."""
+        if self.backend == 'numpy' and isinstance(self.board, PackedBoard):
+            return self._locate_forklift_accessible_paper_rolls_numpy()
+        if isinstance(self.board, PackedBoard):
+            return self._locate_forklift_accessible_paper_rolls_packed()
         score_board = self._score_board(self.board)
         rows = len(self.board)
         cols = len(self.board[0]) if rows > 0 else 0
@@ -66,6 +378,51 @@ class ForkliftAccessiblePaperRollLocater:
                         answer_board[r][c] = Symbol.FORKLIFT_ACCESSIBLE_PAPER_ROLL
         return answer_board
 
+    def _locate_forklift_accessible_paper_rolls_packed(self) -> PackedBoard:
+        """Same as locate_forklift_accessible_paper_rolls, counting neighbours of whole rows at once with bitmasks.
+        The 8 shifted neighbour masks go through a bit-sliced counter, so a roll is accessible unless its count reaches 4.
+        Marks are written by spreading the accessible bits to one byte per cell, and adding the '@' to 'x' code delta to the row as a big int."""
+        board = self.board
+        width_mask = (1 << board.n_cols) - 1
+        zero_bytes = int.from_bytes(b'0' * board.n_cols)
+        rolls = board.paper_roll_bitmasks()
+        answer_board = deepcopy(board)
+        for r, row_rolls in enumerate(rolls):
+            neighbours = [row_rolls << 1 & width_mask, row_rolls >> 1]
+            for adjacent_rolls in (rolls[r - 1] if r > 0 else 0, rolls[r + 1] if r + 1 < len(rolls) else 0):
+                neighbours += [adjacent_rolls << 1 & width_mask, adjacent_rolls, adjacent_rolls >> 1]
+            ones = twos = at_least_four = 0
+            for neighbour in neighbours:
+                carry = ones & neighbour
+                ones ^= neighbour
+                at_least_four |= twos & carry
+                twos ^= carry
+            accessible = row_rolls & ~at_least_four
+            if accessible:
+                offset = r * board.n_cols
+                accessible_bytes = int.from_bytes(format(accessible, f'0{board.n_cols}b').encode()) - zero_bytes
+                row_cells = int.from_bytes(answer_board.cells[offset:offset + board.n_cols])
+                answer_board.cells[offset:offset + board.n_cols] = (row_cells + accessible_bytes * _PAPER_ROLL_TO_ACCESSIBLE_DELTA).to_bytes(board.n_cols)
+        return answer_board
+
+    def _locate_forklift_accessible_paper_rolls_numpy(self) -> PackedBoard:
+        """Same as locate_forklift_accessible_paper_rolls, scoring and marking the whole board in one vectorized pass."""
+        score_board, accessible = self._score_board_numpy(self.board)
+        answer_board = deepcopy(self.board)
+        answer_board.as_array()[accessible] = ord(Symbol.FORKLIFT_ACCESSIBLE_PAPER_ROLL.value)
+        return answer_board
+
+    def _score_board_numpy(self, board: PackedBoard):
+        """Vectorized _score_board: the sum of the 8 shifted views of the zero-padded paper roll mask.
+        Also returns the mask of forklift-accessible paper rolls, computed from the same scores."""
+        paper_rolls = board.as_array() == ord(Symbol.PAPER_ROLL.value)
+        padded = np.pad(paper_rolls, 1).astype(np.uint8)
+        score_board = np.zeros(paper_rolls.shape, dtype=np.uint8)
+        for dr, dc in NEIGHBOUR_OFFSETS:
+            score_board += padded[1 + dr:1 + dr + board.n_rows, 1 + dc:1 + dc + board.n_cols]
+        accessible = paper_rolls & (score_board < 4)
+        return score_board, accessible
+
     def _is_forklift_accessible(self, score: int) -> bool:
         """Determine if a paper roll is forklift-accessible based on its score."""
         return score < 4
@@ -79,7 +436,7 @@ class ForkliftAccessiblePaperRollLocater:
         for r in range(rows):
             for c in range(cols):
                 if board[r][c] == Symbol.PAPER_ROLL:
-                    for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]:
+                    for dr, dc in NEIGHBOUR_OFFSETS:
                         nr, nc = r + dr, c + dc
                         if 0 <= nr < rows and 0 <= nc < cols:
                             score_board[nr][nc] += 1
@@ -89,14 +446,73 @@ class ForkliftAccessiblePaperRollLocater:
     def load_board(self, filename):
         """Load ranges from a text file."""
         filepath = os.path.join(RESOURCE_DIR, filename)
-        with open(filepath, 'r') as file:
-            self.board = [[Symbol(char) for char in line.strip()] for line in file.readlines()]
+        if self.backend in ('packed', 'numpy'):
+            self.board = PackedBoard.from_file(filepath)
+            return
+        with MappedBoard.open(filepath) as mapped:
+            self.board = [list(map(_SYMBOL_BY_CODE.__getitem__, row)) for row in mapped]
+
+def _neighbour_position_offsets(width: int) -> List[int]:
+    """Offsets of the 8 neighbours of a cell in a padded board flattened with the given row width."""
+    return [dr * width + dc for dr, dc in NEIGHBOUR_OFFSETS]
+
+
+@contextmanager
+def _attach_padded_board(shared_memory_name: str, n_cells: int):
+    """Attach to the padded flags and scores a worker shares with the main process."""
+    shared_memory = SharedMemory(name=shared_memory_name, track=False)
+    flags, scores = shared_memory.buf[:n_cells], shared_memory.buf[n_cells:2 * n_cells]
+    try:
+        yield flags, scores
+    finally:
+        flags.release()
+        scores.release()
+        shared_memory.close()
+
+
+def _score_stripe(shared_memory_name: str, n_cells: int, width: int, first_row: int, end_row: int) -> List[int]:
+    """Score the rolls of padded rows [first_row, end_row), reading one halo row on each side. Returns the stripe's first wave."""
+    offsets = _neighbour_position_offsets(width)
+    wave = []
+    with _attach_padded_board(shared_memory_name, n_cells) as (flags, scores):
+        for position in range(first_row * width, end_row * width):
+            flag = flags[position]
+            if flag:
+                score = sum(1 for offset in offsets if flags[position + offset])
+                scores[position] = score
+                if flag == 2 or score < 4:
+                    wave.append(position)
+    return wave
+
+
+def _peel_stripe(shared_memory_name: str, n_cells: int, width: int, first_row: int, end_row: int, wave: List[int], removed: List[int]) -> List[int]:
+    """Remove the stripe's wave, then decrement the stripe's rolls next to the removed ones, halo rows included.
+    Returns the stripe's rolls whose score dropped below 4, which form its next wave."""
+    offsets = _neighbour_position_offsets(width)
+    start, end = first_row * width, end_row * width
+    next_wave = []
+    with _attach_padded_board(shared_memory_name, n_cells) as (flags, scores):
+        for position in wave:
+            flags[position] = 0
+        for position in removed:
+            for offset in offsets:
+                neighbour = position + offset
+                if start <= neighbour < end and flags[neighbour]:
+                    scores[neighbour] -= 1
+                    if scores[neighbour] == 3:
+                        next_wave.append(neighbour)
+    return next_wave
+
 
 class Printer:
     """Class to print the map of forklift-accessible paper rolls."""
     @staticmethod
-    def print_board(board: List[List[Symbol]]) -> None:
+    def print_board(board: Board) -> None:
         """Print the board."""
+        if isinstance(board, PackedBoard):
+            for row in board:
+                print(row.tobytes().decode())
+            return
         for row in board:
             print(''.join(symbol.value for symbol in row))
 
@@ -135,16 +551,18 @@ if __name__ == "__main__":
     locater.load_board(puzzle_input_sample_txt_filename)
     n_paperrolls_before = locater.count_paper_rolls()
     print(f"Number of paper rolls before iterations: {n_paperrolls_before}")
-    locater.iteratively_remove_forklift_accessible_paper_rolls()
+    waves = locater.iteratively_remove_forklift_accessible_paper_rolls()
     n_paperrolls_after = locater.count_paper_rolls()
     print(f"Number of paper rolls after iterations: {n_paperrolls_after}")
     print(f"Number of removed paper rolls: {n_paperrolls_before - n_paperrolls_after}")
+    print(f"Removed paper rolls per wave: {waves}")
     print("")
     print("Puzzle results:")
     locater.load_board(puzzle_input_txt_filename)
     n_paperrolls_before = locater.count_paper_rolls()
     print(f"Number of paper rolls before iterations: {n_paperrolls_before}")
-    locater.iteratively_remove_forklift_accessible_paper_rolls()
+    waves = locater.iteratively_remove_forklift_accessible_paper_rolls()
     n_paperrolls_after = locater.count_paper_rolls()
     print(f"Number of paper rolls after iterations: {n_paperrolls_after}")
     print(f"Number of removed paper rolls: {n_paperrolls_before - n_paperrolls_after}")
+    print(f"Number of removal waves: {len(waves)}")
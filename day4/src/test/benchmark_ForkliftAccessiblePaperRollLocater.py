@@ -0,0 +1,121 @@
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from day4.src.main.python.ForkliftAccessiblePaperRollLocater import ForkliftAccessiblePaperRollLocater, MappedBoard, Symbol
+
+
+def _write_board(n_rows: int, n_cols: int, seed: int = 42) -> str:
+    """Write a random board with about two paper rolls for every space, and return its path."""
+    rng = random.Random(seed)
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as file:
+        file.write('\n'.join(''.join(rng.choice('@@.') for _ in range(n_cols)) for _ in range(n_rows)))
+        return file.name
+
+
+def _time(fn) -> tuple:
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def benchmark_packed_board_memory(size: int = 1000):
+    """Compare the memory held by a loaded board, and the time to locate accessible rolls, for the list and packed backends."""
+    print("======Packed board vs list of Symbol lists======")
+    filepath = _write_board(size, size)
+    for backend in ('list', 'packed'):
+        locater = ForkliftAccessiblePaperRollLocater(backend)
+        tracemalloc.start()
+        _, load_seconds = _time(lambda: locater.load_board(filepath))
+        board_bytes, load_peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        _, locate_seconds = _time(locater.locate_forklift_accessible_paper_rolls)
+        _, locate_peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{size}x{size} {backend}: board {board_bytes / 2 ** 20:.1f} MiB (load peak {load_peak_bytes / 2 ** 20:.1f} MiB, {load_seconds:.3f}s), "
+              f"locate peak {locate_peak_bytes / 2 ** 20:.1f} MiB, {locate_seconds:.3f}s")
+    os.remove(filepath)
+
+
+def benchmark_numpy_scoring():
+    """Compare the time to locate accessible rolls with the packed bitmask counter and the NumPy shifted sums."""
+    print("======NumPy shifted sums vs packed bitmask counter======")
+    for size in [1000, 2000, 4000]:
+        filepath = _write_board(size, size)
+        answers = []
+        print(f"{size}x{size}:", end='')
+        for backend in ('packed', 'numpy'):
+            locater = ForkliftAccessiblePaperRollLocater(backend)
+            locater.load_board(filepath)
+            answer_board, seconds = _time(locater.locate_forklift_accessible_paper_rolls)
+            answers.append(bytes(answer_board.cells))
+            print(f" {backend} {seconds:.3f}s", end='')
+        assert answers[0] == answers[1]
+        print()
+        os.remove(filepath)
+
+
+def benchmark_peeling_against_rescanning():
+    """Compare the queue-driven peeling with the reference loop relocating on the whole board after each removal."""
+    print("======Peeling vs rescanning iterative removal======")
+    for size in [30, 60, 1000, 2000]:
+        filepath = _write_board(size, size)
+        peeling = ForkliftAccessiblePaperRollLocater('packed')
+        peeling.load_board(filepath)
+        waves, peeling_seconds = _time(peeling.iteratively_remove_forklift_accessible_paper_rolls)
+        print(f"{size}x{size}: {sum(waves)} rolls removed in {len(waves)} waves, peeling {peeling_seconds:.3f}s", end='')
+        if size <= 100:
+            rescanning = ForkliftAccessiblePaperRollLocater('packed')
+            rescanning.load_board(filepath)
+            _, rescanning_seconds = _time(rescanning._iteratively_remove_forklift_accessible_paper_rolls_by_rescanning)
+            assert rescanning.board.cells == peeling.board.cells
+            print(f", rescanning {rescanning_seconds:.3f}s", end='')
+        print()
+        os.remove(filepath)
+
+
+def benchmark_parallel_scaling(size: int = 2000):
+    """Measure the striped shared-memory peeling at 1, 2, 4 and 8 workers against the single-process peeling."""
+    print("======Parallel striped peeling scaling======")
+    filepath = _write_board(size, size)
+    locater = ForkliftAccessiblePaperRollLocater('packed')
+    locater.load_board(filepath)
+    expected, baseline_seconds = _time(locater.iteratively_remove_forklift_accessible_paper_rolls)
+    print(f"{size}x{size}: single process {baseline_seconds:.3f}s")
+    for workers in [1, 2, 4, 8]:
+        locater.load_board(filepath)
+        waves, seconds = _time(lambda: locater._iteratively_remove_forklift_accessible_paper_rolls_in_parallel(workers))
+        assert waves == expected
+        print(f"{workers} workers: {seconds:.3f}s, speedup {baseline_seconds / seconds:.2f}x")
+    os.remove(filepath)
+
+
+def benchmark_board_loading(size: int = 4000):
+    """Compare building a Symbol per cell line by line with the memory-mapped loader behind every backend."""
+    print("======Memory-mapped board loading======")
+    filepath = _write_board(size, size)
+
+    def load_symbol_per_cell():
+        with open(filepath, 'r') as file:
+            return [[Symbol(char) for char in line.strip()] for line in file.readlines()]
+
+    symbol_board, seconds = _time(load_symbol_per_cell)
+    print(f"{size}x{size}: Symbol per cell {seconds:.3f}s", end='')
+    _, seconds = _time(lambda: MappedBoard.open(filepath).close())
+    print(f", mapped view {seconds:.3f}s", end='')
+    for backend in ('list', 'packed'):
+        locater = ForkliftAccessiblePaperRollLocater(backend)
+        _, seconds = _time(lambda: locater.load_board(filepath))
+        assert [''.join(symbol.value for symbol in row) for row in locater.board] == [''.join(symbol.value for symbol in row) for row in symbol_board]
+        print(f", {backend} {seconds:.3f}s", end='')
+    print()
+    os.remove(filepath)
+
+
+if __name__ == "__main__":
+    benchmark_board_loading()
+    benchmark_packed_board_memory()
+    benchmark_numpy_scoring()
+    benchmark_peeling_against_rescanning()
+    benchmark_parallel_scaling()
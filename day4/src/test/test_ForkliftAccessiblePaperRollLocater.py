@@ -0,0 +1,301 @@
+import pytest
+import os
+import random
+import day4.src.main.python.ForkliftAccessiblePaperRollLocater as module
+from day4.src.main.python.ForkliftAccessiblePaperRollLocater import ForkliftAccessiblePaperRollLocater, MappedBoard, PackedBoard, Symbol, Printer, RESOURCE_DIR
+
+SAMPLE_BOARD = "puzzle_input_sample.txt"
+SAMPLE_ANSWER_BOARD = "puzzle_input_sample_answer.txt"
+
+
+def _rows(board) -> list:
+    return [''.join(symbol.value for symbol in row) for row in board]
+
+
+def _random_board_file(tmp_path, n_rows: int, n_cols: int, seed: int) -> str:
+    rng = random.Random(seed)
+    board_file = tmp_path / f"board_{seed}.txt"
+    board_file.write_text('\n'.join(''.join(rng.choice('@@.') for _ in range(n_cols)) for _ in range(n_rows)) + '\n')
+    return str(board_file)
+
+
+class TestPackedBoard:
+
+    @pytest.fixture
+    def locaters(self):
+        locaters = {}
+        for backend in ('list', 'packed'):
+            locater = ForkliftAccessiblePaperRollLocater(backend)
+            locater.load_board(SAMPLE_BOARD)
+            locaters[backend] = locater
+        return locaters
+
+    def test_load_board_packs_one_byte_per_cell(self, locaters):
+        board = locaters['packed'].board
+        assert isinstance(board, PackedBoard)
+        assert (board.n_rows, board.n_cols) == (10, 10)
+        assert len(board.cells) == 100
+        assert _rows(board) == _rows(locaters['list'].board)
+
+    def test_rows_behave_like_symbol_lists(self, locaters):
+        board = locaters['packed'].board
+        assert board[0][2] == Symbol.PAPER_ROLL
+        assert board[0][0] == Symbol.SPACE
+        board[0][0] = Symbol.PAPER_ROLL
+        assert board[0][0] == Symbol.PAPER_ROLL
+        assert board[0].count(Symbol.PAPER_ROLL) == 7
+
+    def test_locate_matches_list_backend_and_sample_answer(self, locaters):
+        packed_answer = locaters['packed'].locate_forklift_accessible_paper_rolls()
+        list_answer = locaters['list'].locate_forklift_accessible_paper_rolls()
+        expected = ForkliftAccessiblePaperRollLocater()
+        expected.load_board(SAMPLE_ANSWER_BOARD)
+        assert _rows(packed_answer) == _rows(list_answer) == _rows(expected.board)
+        assert locaters['packed'].count_forklift_accessible_paper_rolls(packed_answer) == 13
+
+    def test_iterative_removal_matches_list_backend(self, locaters):
+        removed = {}
+        for backend, locater in locaters.items():
+            before = locater.count_paper_rolls()
+            locater.iteratively_remove_forklift_accessible_paper_rolls()
+            removed[backend] = before - locater.count_paper_rolls()
+        assert removed == {'list': 43, 'packed': 43}
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_locate_matches_list_backend_on_random_boards(self, tmp_path, seed):
+        filepath = _random_board_file(tmp_path, 17, 23, seed)
+        answers = []
+        for backend in ('list', 'packed'):
+            locater = ForkliftAccessiblePaperRollLocater(backend)
+            locater.load_board(filepath)
+            answers.append(_rows(locater.locate_forklift_accessible_paper_rolls()))
+        assert answers[0] == answers[1]
+
+    def test_printer_output_is_unchanged(self, locaters, capsys):
+        Printer.print_board(locaters['list'].board)
+        list_output = capsys.readouterr().out
+        Printer.print_board(locaters['packed'].board)
+        assert capsys.readouterr().out == list_output
+
+    def test_invalid_symbol_raises(self, tmp_path):
+        board_file = tmp_path / "invalid.txt"
+        board_file.write_text("..@\n.?@\n")
+        locater = ForkliftAccessiblePaperRollLocater('packed')
+        with pytest.raises(ValueError, match="'\\?' is not a valid Symbol, found on row 1"):
+            locater.load_board(str(board_file))
+
+    def test_unknown_backend_raises(self):
+        with pytest.raises(ValueError, match="Unknown backend"):
+            ForkliftAccessiblePaperRollLocater('sparse')
+
+
+class TestNumpyBackend:
+
+    @pytest.fixture(autouse=True)
+    def numpy(self):
+        return pytest.importorskip("numpy")
+
+    @pytest.mark.parametrize("filename", [SAMPLE_BOARD, "puzzle_input.txt"])
+    def test_scores_match_python_scores_cell_for_cell(self, filename):
+        list_locater = ForkliftAccessiblePaperRollLocater('list')
+        list_locater.load_board(filename)
+        numpy_locater = ForkliftAccessiblePaperRollLocater('numpy')
+        numpy_locater.load_board(filename)
+        score_board, accessible = numpy_locater._score_board_numpy(numpy_locater.board)
+        expected_scores = list_locater._score_board(list_locater.board)
+        assert score_board.tolist() == expected_scores
+        assert accessible.tolist() == [[symbol == Symbol.PAPER_ROLL and score < 4 for symbol, score in zip(row, scores)]
+                                       for row, scores in zip(list_locater.board, expected_scores)]
+
+    def test_locate_matches_sample_answer(self):
+        locater = ForkliftAccessiblePaperRollLocater('numpy')
+        locater.load_board(SAMPLE_BOARD)
+        expected = ForkliftAccessiblePaperRollLocater()
+        expected.load_board(SAMPLE_ANSWER_BOARD)
+        answer_board = locater.locate_forklift_accessible_paper_rolls()
+        assert _rows(answer_board) == _rows(expected.board)
+        assert _rows(locater.board) != _rows(answer_board)
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_locate_matches_list_backend_on_random_boards(self, tmp_path, seed):
+        filepath = _random_board_file(tmp_path, 19, 7, seed)
+        answers = []
+        for backend in ('list', 'numpy'):
+            locater = ForkliftAccessiblePaperRollLocater(backend)
+            locater.load_board(filepath)
+            answers.append(_rows(locater.locate_forklift_accessible_paper_rolls()))
+        assert answers[0] == answers[1]
+
+    def test_iterative_removal_matches_list_backend(self):
+        locater = ForkliftAccessiblePaperRollLocater('numpy')
+        locater.load_board(SAMPLE_BOARD)
+        before = locater.count_paper_rolls()
+        locater.iteratively_remove_forklift_accessible_paper_rolls()
+        assert before - locater.count_paper_rolls() == 43
+
+    def test_numpy_backend_without_numpy_raises(self, monkeypatch):
+        monkeypatch.setattr(module, "np", None)
+        with pytest.raises(ImportError, match="requires NumPy"):
+            ForkliftAccessiblePaperRollLocater('numpy')
+
+
+class TestIterativeRemoval:
+
+    @pytest.mark.parametrize("backend", ['list', 'packed'])
+    def test_sample_waves(self, backend):
+        locater = ForkliftAccessiblePaperRollLocater(backend)
+        locater.load_board(SAMPLE_BOARD)
+        assert locater.iteratively_remove_forklift_accessible_paper_rolls() == [13, 12, 7, 5, 2, 1, 1, 1, 1]
+        assert locater.count_paper_rolls() == 71 - 43
+
+    @pytest.mark.parametrize("backend", ['list', 'packed'])
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_rescanning_on_random_boards(self, tmp_path, backend, seed):
+        filepath = _random_board_file(tmp_path, 11, 13, seed)
+        peeling = ForkliftAccessiblePaperRollLocater(backend)
+        peeling.load_board(filepath)
+        rescanning = ForkliftAccessiblePaperRollLocater(backend)
+        rescanning.load_board(filepath)
+        n_paper_rolls_before = peeling.count_paper_rolls()
+        waves = peeling.iteratively_remove_forklift_accessible_paper_rolls()
+        rescanning._iteratively_remove_forklift_accessible_paper_rolls_by_rescanning()
+        assert _rows(peeling.board) == _rows(rescanning.board)
+        assert sum(waves) == n_paper_rolls_before - peeling.count_paper_rolls()
+
+    def test_first_wave_is_the_located_rolls(self):
+        locater = ForkliftAccessiblePaperRollLocater()
+        locater.load_board("puzzle_input.txt")
+        n_accessible = locater.count_forklift_accessible_paper_rolls(locater.locate_forklift_accessible_paper_rolls())
+        waves = locater.iteratively_remove_forklift_accessible_paper_rolls()
+        assert waves[0] == n_accessible == 1428
+        assert sum(waves) == 8936
+
+    def test_marked_rolls_are_removed_in_the_first_wave(self):
+        locater = ForkliftAccessiblePaperRollLocater()
+        locater.load_board(SAMPLE_ANSWER_BOARD)
+        assert locater.iteratively_remove_forklift_accessible_paper_rolls()[0] == 13
+        assert locater.count_paper_rolls() == 71 - 43
+
+    def test_empty_board(self):
+        locater = ForkliftAccessiblePaperRollLocater()
+        locater.board = []
+        assert locater.iteratively_remove_forklift_accessible_paper_rolls() == []
+
+
+class TestParallelRemoval:
+
+    @pytest.mark.parametrize("workers", [2, 3])
+    def test_sample_waves_match_single_process(self, workers):
+        locater = ForkliftAccessiblePaperRollLocater('packed')
+        locater.load_board(SAMPLE_BOARD)
+        assert locater.iteratively_remove_forklift_accessible_paper_rolls(workers=workers) == [13, 12, 7, 5, 2, 1, 1, 1, 1]
+        assert locater.count_paper_rolls() == 71 - 43
+
+    @pytest.mark.parametrize("backend", ['list', 'packed'])
+    @pytest.mark.parametrize("seed", range(3))
+    def test_matches_single_process_on_random_boards(self, tmp_path, backend, seed):
+        filepath = _random_board_file(tmp_path, 23, 9, seed)
+        single = ForkliftAccessiblePaperRollLocater(backend)
+        single.load_board(filepath)
+        parallel = ForkliftAccessiblePaperRollLocater(backend)
+        parallel.load_board(filepath)
+        assert parallel.iteratively_remove_forklift_accessible_paper_rolls(workers=4) == single.iteratively_remove_forklift_accessible_paper_rolls()
+        assert _rows(parallel.board) == _rows(single.board)
+
+    def test_puzzle_removal_count(self):
+        locater = ForkliftAccessiblePaperRollLocater('packed')
+        locater.load_board("puzzle_input.txt")
+        assert sum(locater.iteratively_remove_forklift_accessible_paper_rolls(workers=2)) == 8936
+
+    def test_more_workers_than_rows(self, tmp_path):
+        board_file = tmp_path / "tiny.txt"
+        board_file.write_text("@@@\n")
+        locater = ForkliftAccessiblePaperRollLocater()
+        locater.load_board(str(board_file))
+        assert locater.iteratively_remove_forklift_accessible_paper_rolls(workers=8) == [3]
+
+
+class TestMappedBoard:
+
+    @pytest.mark.parametrize("content", [b"@@.\n.@@\n", b"@@.\r\n.@@\r\n", b"@@.\n.@@", b"@@.\n.@@\n\n"])
+    def test_detects_stride_and_drops_terminators(self, tmp_path, content):
+        board_file = tmp_path / "board.txt"
+        board_file.write_bytes(content)
+        with MappedBoard.open(str(board_file)) as mapped:
+            assert (mapped.n_rows, mapped.n_cols) == (2, 3)
+            assert mapped.stride == content.index(b'\n') + 1
+            assert [bytes(row) for row in mapped] == [b"@@.", b".@@"]
+            assert mapped.tobytes() == b"@@..@@"
+
+    @pytest.mark.parametrize("content", [b"@@. \n.@@\t\n", b"@@.\t \r\n.@@\r\n", b"@@.\n.@@  ", b"@@.\n.@@\n \n"])
+    def test_trailing_blanks_are_ignored(self, tmp_path, content):
+        board_file = tmp_path / "board.txt"
+        board_file.write_bytes(content)
+        with MappedBoard.open(str(board_file)) as mapped:
+            assert [bytes(row) for row in mapped] == [b"@@.", b".@@"]
+            assert mapped.tobytes() == b"@@..@@"
+
+    @pytest.mark.parametrize("backend", ['list', 'packed'])
+    def test_load_board_accepts_trailing_blanks(self, tmp_path, backend):
+        board_file = tmp_path / "board.txt"
+        board_file.write_text("..@ \n.@@\n")
+        locater = ForkliftAccessiblePaperRollLocater(backend)
+        locater.load_board(str(board_file))
+        assert [list(row) for row in locater.board] == [[Symbol.SPACE, Symbol.SPACE, Symbol.PAPER_ROLL], [Symbol.SPACE, Symbol.PAPER_ROLL, Symbol.PAPER_ROLL]]
+
+    def test_blanks_inside_a_row_raise(self, tmp_path):
+        board_file = tmp_path / "invalid.txt"
+        board_file.write_bytes(b"@ .\n.@@\n")
+        with pytest.raises(ValueError, match="' ' is not a valid Symbol, found on row 0, column 1"):
+            MappedBoard.open(str(board_file))
+
+    def test_rows_are_read_only_views(self):
+        with MappedBoard.open(os.path.join(RESOURCE_DIR, SAMPLE_BOARD)) as mapped:
+            row = mapped[0]
+            assert row.readonly
+            with pytest.raises(TypeError):
+                row[0] = ord(Symbol.SPACE.value)
+            row.release()
+
+    def test_as_array_is_a_read_only_strided_view(self):
+        np = pytest.importorskip("numpy")
+        packed = PackedBoard.from_file(os.path.join(RESOURCE_DIR, SAMPLE_BOARD))
+        with MappedBoard.open(os.path.join(RESOURCE_DIR, SAMPLE_BOARD)) as mapped:
+            grid = mapped.as_array()
+            assert not grid.flags.writeable
+            assert np.array_equal(grid, packed.as_array())
+            del grid
+
+    @pytest.mark.parametrize("content, message", [
+        (b"..@\n.?@\n", "'\\?' is not a valid Symbol, found on row 1, column 1"),
+        (b"..@\n.@@\n@@x\n#..\n", "'#' is not a valid Symbol, found on row 3, column 0"),
+        (b"..@\n.@\n..@\n", "Row 1 has 2 cells, expected 3"),
+        (b"..@\n.@@@\n", "Row 1 has 4 cells, expected 3"),
+        (b"@.\n.\n.\n", "Row 1 has 1 cells, expected 2"),
+    ])
+    def test_invalid_boards_raise(self, tmp_path, content, message):
+        board_file = tmp_path / "invalid.txt"
+        board_file.write_bytes(content)
+        with pytest.raises(ValueError, match=message):
+            MappedBoard.open(str(board_file))
+
+    def test_invalid_symbol_in_a_later_scan_block(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(module, "MMAP_SCAN_BLOCK_BYTES", 8)
+        board_file = tmp_path / "invalid.txt"
+        board_file.write_bytes(b"..@\n" * 10 + b".@!\n")
+        with pytest.raises(ValueError, match="found on row 10, column 2"):
+            MappedBoard.open(str(board_file))
+
+    def test_empty_file(self, tmp_path):
+        board_file = tmp_path / "empty.txt"
+        board_file.write_bytes(b"")
+        with MappedBoard.open(str(board_file)) as mapped:
+            assert len(mapped) == 0
+            assert mapped.tobytes() == b""
+
+    @pytest.mark.parametrize("backend", ['list', 'packed'])
+    def test_load_board_reports_row_and_column(self, tmp_path, backend):
+        board_file = tmp_path / "invalid.txt"
+        board_file.write_text("..@\n.@@\n@?.\n")
+        with pytest.raises(ValueError, match="found on row 2, column 1"):
+            ForkliftAccessiblePaperRollLocater(backend).load_board(str(board_file))
@@ -1,9 +1,129 @@
+import hashlib
+import heapq
+import mmap
 import os
+import shutil
+import struct
+import tempfile
+import weakref
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, takewhile
 from enum import Enum
 from copy import deepcopy
-from typing import List, Set, Tuple
+from typing import Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the python backend covers everything
+    np = None
 
 RESOURCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources')
+NUMPY_BACKEND_THRESHOLD = 10_000
+BACKENDS = ('auto', 'python', 'numpy')
+ID_RUN_SIZE = 1 << 22
+RANGE_RUN_SIZE = 1 << 21
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+MAX_MERGE_FAN_IN = 64
+READ_BUFFER_SIZE = 1 << 20
+SNAPSHOT_MAGIC = b'AOC25D5S'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HAS_IDS = 1
+# magic, version, flags, source size, source mtime in ns, number of ranges, number of IDs, source blake2b digest
+SNAPSHOT_HEADER = struct.Struct('<8sIIQqQQ16s')
+
+
+class SortedIngredientIdSpool:
+    """Ingredient IDs stored as packed int64 values and read back in sorted order.
+    IDs are buffered in an array('q'). Once the buffer holds max_ids_in_memory IDs, it is sorted and spilled to a temporary
+    file as a run, so memory stays bounded however many IDs are added. Iterating k-way merges the runs with the buffer.
+    IDs must fit in a signed 64 bit integer, otherwise adding them raises OverflowError."""
+
+    def __init__(self, max_ids_in_memory: int = ID_RUN_SIZE):
+        self.max_ids_in_memory = max_ids_in_memory
+        self._buffer = array('q')
+        self._is_buffer_sorted = True
+        self._run_paths: List[str] = []
+        self._spill_dir = None
+        self._cleanup = None
+
+    def extend(self, ingredient_ids: Iterable[int]):
+        """Add a batch of IDs. The buffer is spilled once it reaches max_ids_in_memory, so it never holds more than that plus one batch."""
+        self._buffer.extend(ingredient_ids)
+        self._is_buffer_sorted = False
+        if len(self._buffer) >= self.max_ids_in_memory:
+            self._spill()
+
+    def _spill(self):
+        """Sort the buffer and write it to a new run file."""
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix='ingredient_ids_')
+            self._cleanup = weakref.finalize(self, shutil.rmtree, self._spill_dir, ignore_errors=True)
+        run_path = os.path.join(self._spill_dir, f'run_{len(self._run_paths)}.bin')
+        with open(run_path, 'wb') as run_file:
+            array('q', sorted(self._buffer)).tofile(run_file)
+        self._run_paths.append(run_path)
+        self._buffer = array('q')
+        self._is_buffer_sorted = True
+
+    def __len__(self) -> int:
+        return len(self._buffer) + sum(os.path.getsize(run_path) for run_path in self._run_paths) // self._buffer.itemsize
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over the IDs in ascending order, duplicates included."""
+        if not self._is_buffer_sorted:
+            self._buffer = array('q', sorted(self._buffer))
+            self._is_buffer_sorted = True
+        if not self._run_paths:
+            return iter(self._buffer)
+        return heapq.merge(self._buffer, *(_iterate_run(run_path) for run_path in self._run_paths))
+
+    def close(self):
+        """Remove the spilled runs."""
+        if self._cleanup is not None:
+            self._cleanup()
+        self._buffer = array('q')
+        self._run_paths = []
+
+
+def _iterate_run(run_path: str, block_size: int = READ_BUFFER_SIZE // 8) -> Iterator[int]:
+    """Read a spilled run back block by block."""
+    with open(run_path, 'rb') as run_file:
+        while True:
+            block = array('q')
+            try:
+                block.fromfile(run_file, block_size)
+            except EOFError:  # the last block is shorter, fromfile still keeps what it read
+                yield from block
+                return
+            yield from block
+
+class MappedRanges:
+    """Read-only sequence of (start_id, end_id) ranges over parallel int64 memoryviews, such as the arrays of a mapped snapshot."""
+
+    def __init__(self, starts: memoryview, ends: memoryview):
+        self.starts = starts
+        self.ends = ends
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, i: int) -> Tuple[int, int]:
+        return self.starts[i], self.ends[i]
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return zip(self.starts, self.ends)
+
+
+def _hash_file(file_path: str) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(READ_BUFFER_SIZE), b''):
+            digest.update(block)
+    return digest.digest()
+
 
 class FreshIngredientDatabase:
     """Class to manage fresh food database.
@@ -11,28 +131,162 @@ class FreshIngredientDatabase:
     Every id falls into that range is considered fresh food ID.
     """
 
-    def __init__(self):
-        self.fresh_ingredient_id_ranges: List[Tuple[int, int]] = []
-        self.available_ingredient_ids: Set[int] = set()
+    def __init__(self, streaming: bool = False, max_ids_in_memory: int = ID_RUN_SIZE, max_ranges_in_memory: int = RANGE_RUN_SIZE, workers: int = 1):
+        self.streaming = streaming
+        self.max_ids_in_memory = max_ids_in_memory
+        self.max_ranges_in_memory = max_ranges_in_memory
+        self.workers = workers
+        self.fresh_ingredient_id_ranges: Union[List[Tuple[int, int]], FreshIngredientIdIntervalSet, MappedRanges] = []
+        self.available_ingredient_ids: Union[Set[int], SortedIngredientIdSpool, memoryview] = set()
 
     def load_data_from_file(self, file_path: str):
-        """Load fresh ingredient ID ranges from a file."""
+        """Load fresh ingredient ID ranges from a file, adding them to the ranges already loaded or edited.
+        In streaming mode, the ranges are merged with an external sort, see _load_ranges_with_external_sort,
+        and the available IDs go into a SortedIngredientIdSpool rather than a set, read a buffer of lines at a time."""
         with open(file_path, 'r') as f:
+            if self.streaming:
+                self._load_ranges_with_external_sort(f)
+                self.available_ingredient_ids = SortedIngredientIdSpool(self.max_ids_in_memory)
+                for lines in iter(lambda: f.readlines(READ_BUFFER_SIZE), []):
+                    self.available_ingredient_ids.extend(int(line) for line in lines if not line.isspace())
+                return
+
+            ranges = []
             while True:
                 line = f.readline()
                 if line == '\n' or not line:
                     break
                 start_id, end_id = map(int, line.strip().split('-'))
-                self.fresh_ingredient_id_ranges.append((start_id, end_id))
+                ranges.append((start_id, end_id))
 
-            self._preprocess_fresh_ingredient_id_ranges()
+            if isinstance(self.fresh_ingredient_id_ranges, FreshIngredientIdIntervalSet):
+                for start_id, end_id in ranges:
+                    self.fresh_ingredient_id_ranges.add(start_id, end_id)
+            else:
+                self.fresh_ingredient_id_ranges = list(self.fresh_ingredient_id_ranges) + ranges  # ranges mapped from a snapshot are read-only
+                self._preprocess_fresh_ingredient_id_ranges()
             
+            if not isinstance(self.available_ingredient_ids, set):
+                self.available_ingredient_ids = set(self.available_ingredient_ids)
             lines = f.readlines()
             for line in lines:
                 self.available_ingredient_ids.add(int(line.strip()))
 
+    def _load_ranges_with_external_sort(self, f):
+        """Merge the range section chunk by chunk: each chunk is parsed, sorted and merged in a worker process,
+        then spilled as a sorted run of packed int64 pairs to a temporary file. The runs are k-way merged into the final ranges.
+        Peak memory is set by max_ranges_in_memory, the number of range lines read ahead, split into
+        CHUNKS_IN_FLIGHT_PER_WORKER chunks per worker. Bounds must fit in int64, otherwise spilling raises OverflowError."""
+        chunk_size = max(1, self.max_ranges_in_memory // (max(1, self.workers) * CHUNKS_IN_FLIGHT_PER_WORKER))
+        range_lines = takewhile(lambda line: not line.isspace(), iter(f.readline, ''))
+        chunks = iter(lambda: list(islice(range_lines, chunk_size)), [])
+        with tempfile.TemporaryDirectory(prefix='fresh_ingredient_ranges_') as spill_dir:
+            run_paths = []
+            if self.workers <= 1:
+                for i, chunk in enumerate(chunks):
+                    run_paths.append(_sort_and_spill_range_chunk(chunk, os.path.join(spill_dir, f'run_{i}.bin')))
+            else:
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    in_flight = deque()
+                    for i, chunk in enumerate(chunks):
+                        in_flight.append(executor.submit(_sort_and_spill_range_chunk, chunk, os.path.join(spill_dir, f'run_{i}.bin')))
+                        if len(in_flight) >= self.workers * CHUNKS_IN_FLIGHT_PER_WORKER:
+                            run_paths.append(in_flight.popleft().result())
+                    while in_flight:
+                        run_paths.append(in_flight.popleft().result())
+            while len(run_paths) > MAX_MERGE_FAN_IN:  # merge in passes, so no more than MAX_MERGE_FAN_IN runs are open at once
+                run_paths = [
+                    _merge_range_runs(run_paths[i:i + MAX_MERGE_FAN_IN], os.path.join(spill_dir, f'pass_{len(run_paths)}_run_{i}.bin'))
+                    for i in range(0, len(run_paths), MAX_MERGE_FAN_IN)
+                ]
+            runs = [_iterate_range_run(run_path) for run_path in run_paths]
+            self.fresh_ingredient_id_ranges = list(_merge_sorted_ranges(heapq.merge(*runs)))
+
+    @classmethod
+    def load_with_snapshot(cls, file_path: str, snapshot_path: Optional[str] = None) -> 'FreshIngredientDatabase':
+        """Open the snapshot of file_path when it is still fresh, otherwise load the text and save a new snapshot.
+        The snapshot defaults to file_path with a .snapshot suffix. IDs or bounds beyond int64 cannot be snapshotted,
+        so such a database is returned as loaded from the text and no snapshot is saved."""
+        snapshot_path = snapshot_path or file_path + '.snapshot'
+        fresh_ingredient_db = cls.open_snapshot(snapshot_path, file_path)
+        if fresh_ingredient_db is None:
+            fresh_ingredient_db = cls()
+            fresh_ingredient_db.load_data_from_file(file_path)
+            try:
+                fresh_ingredient_db.save_snapshot(snapshot_path, file_path)
+            except OverflowError:
+                pass
+        return fresh_ingredient_db
+
+    def save_snapshot(self, snapshot_path: str, source_path: str, include_ids: bool = True):
+        """Save the merged ranges, and the distinct available IDs unless include_ids is False, in a binary snapshot:
+        a SNAPSHOT_HEADER recording the source file's size, mtime and hash, then the starts, ends and sorted IDs as packed int64 arrays.
+        The snapshot is written next to its final path and moved into place, so readers never see a partial file."""
+        source_stat = os.stat(source_path)
+        starts = array('q', (start_id for start_id, _ in self.fresh_ingredient_id_ranges))
+        ends = array('q', (end_id for _, end_id in self.fresh_ingredient_id_ranges))
+        ingredient_ids = array('q')
+        if include_ids:
+            available_ids = self.available_ingredient_ids
+            sorted_ids = available_ids if isinstance(available_ids, (SortedIngredientIdSpool, memoryview)) else sorted(available_ids)
+            previous_id = None
+            for ingredient_id in sorted_ids:
+                if ingredient_id != previous_id:
+                    ingredient_ids.append(ingredient_id)
+                    previous_id = ingredient_id
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, SNAPSHOT_HAS_IDS if include_ids else 0, source_stat.st_size,
+                                      source_stat.st_mtime_ns, len(starts), len(ingredient_ids), _hash_file(source_path))
+        partial_path = f'{snapshot_path}.{os.getpid()}.partial'
+        with open(partial_path, 'wb') as snapshot_file:
+            snapshot_file.write(header)
+            for values in (starts, ends, ingredient_ids):
+                values.tofile(snapshot_file)
+        os.replace(partial_path, snapshot_path)
+
+    @classmethod
+    def open_snapshot(cls, snapshot_path: str, source_path: Optional[str] = None) -> Optional['FreshIngredientDatabase']:
+        """Map a snapshot saved by save_snapshot, without parsing: the ranges and IDs are int64 memoryviews over the mapping.
+        Returns None when the snapshot is missing, not a snapshot, or stale. A snapshot is stale when the source file's size
+        changed, or when its mtime changed and its content hash no longer matches."""
+        try:
+            with open(snapshot_path, 'rb') as snapshot_file:
+                mapping = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+        if len(mapping) < SNAPSHOT_HEADER.size:
+            mapping.close()
+            return None
+        magic, version, flags, source_size, source_mtime_ns, n_ranges, n_ids, source_hash = SNAPSHOT_HEADER.unpack_from(mapping)
+        if (magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or len(mapping) != SNAPSHOT_HEADER.size + 8 * (2 * n_ranges + n_ids)
+                or (source_path is not None and not _matches_source(source_path, source_size, source_mtime_ns, source_hash))):
+            mapping.close()
+            return None
+        values = memoryview(mapping)[SNAPSHOT_HEADER.size:].cast('q')
+        fresh_ingredient_db = cls()
+        fresh_ingredient_db.fresh_ingredient_id_ranges = MappedRanges(values[:n_ranges], values[n_ranges:2 * n_ranges])
+        if flags & SNAPSHOT_HAS_IDS:
+            fresh_ingredient_db.available_ingredient_ids = values[2 * n_ranges:]
+        fresh_ingredient_db._snapshot_mapping = mapping
+        return fresh_ingredient_db
+
+    def add_fresh_ingredient_id_range(self, start_id: int, end_id: int):
+        """Add a range of fresh ingredient IDs, merging it into the ranges already known."""
+        self._fresh_ingredient_id_interval_set().add(start_id, end_id)
+
+    def remove_fresh_ingredient_id_range(self, start_id: int, end_id: int):
+        """Remove a range of ingredient IDs from the fresh ones, splitting the ranges it cuts."""
+        self._fresh_ingredient_id_interval_set().remove(start_id, end_id)
+
+    def _fresh_ingredient_id_interval_set(self) -> 'FreshIngredientIdIntervalSet':
+        """The ranges become a FreshIngredientIdIntervalSet the first time they are edited."""
+        if not isinstance(self.fresh_ingredient_id_ranges, FreshIngredientIdIntervalSet):
+            self.fresh_ingredient_id_ranges = FreshIngredientIdIntervalSet(self.fresh_ingredient_id_ranges)
+        return self.fresh_ingredient_id_ranges
+
     def count_all_theoretically_fresh_ingredients(self) -> int:
         """Count all theoretically fresh ingredient IDs based on the ID ranges."""
+        if isinstance(self.fresh_ingredient_id_ranges, FreshIngredientIdIntervalSet):
+            return self.fresh_ingredient_id_ranges.n_ids
         total_count = 0
         for start_id, end_id in self.fresh_ingredient_id_ranges:
             total_count += (end_id - start_id + 1)
@@ -41,46 +295,277 @@ class FreshIngredientDatabase:
 
     def _preprocess_fresh_ingredient_id_ranges(self):
         """Preprocess the fresh ingredient ID ranges to merge overlapping ranges."""
-        if not self.fresh_ingredient_id_ranges:
-            return
-        
         # Sort ranges by start_id
         self.fresh_ingredient_id_ranges.sort(key=lambda x: x[0])
-        
-        merged_ranges = []
-        current_start, current_end = self.fresh_ingredient_id_ranges[0]
-        
-        for start, end in self.fresh_ingredient_id_ranges[1:]:
-            if start <= current_end + 1:  # Overlapping or contiguous ranges
-                current_end = max(current_end, end)
+        self.fresh_ingredient_id_ranges = list(_merge_sorted_ranges(self.fresh_ingredient_id_ranges))
+
+
+def _matches_source(source_path: str, source_size: int, source_mtime_ns: int, source_hash: bytes) -> bool:
+    """Whether the source file is still the one a snapshot was saved from. The content is hashed only when the mtime moved."""
+    try:
+        source_stat = os.stat(source_path)
+    except FileNotFoundError:
+        return False
+    if source_stat.st_size != source_size:
+        return False
+    return source_stat.st_mtime_ns == source_mtime_ns or _hash_file(source_path) == source_hash
+
+
+def _merge_sorted_ranges(sorted_ranges: Iterable[Tuple[int, int]]) -> Iterator[Tuple[int, int]]:
+    """Merge overlapping or contiguous ranges, given sorted by start_id."""
+    ranges = iter(sorted_ranges)
+    first_range = next(ranges, None)
+    if first_range is None:
+        return
+    current_start, current_end = first_range
+    for start, end in ranges:
+        if start <= current_end + 1:  # Overlapping or contiguous ranges
+            current_end = max(current_end, end)
+        else:
+            yield current_start, current_end
+            current_start, current_end = start, end
+    yield current_start, current_end
+
+
+def _sort_and_spill_range_chunk(lines: List[str], run_path: str) -> str:
+    """Parse, sort and merge a chunk of range lines in a worker, then write it to run_path as int64 start, end pairs."""
+    ranges = sorted(tuple(map(int, line.split('-'))) for line in lines)
+    run = array('q')
+    for start_id, end_id in _merge_sorted_ranges(ranges):
+        run.append(start_id)
+        run.append(end_id)
+    with open(run_path, 'wb') as run_file:
+        run.tofile(run_file)
+    return run_path
+
+
+def _merge_range_runs(run_paths: List[str], run_path: str) -> str:
+    """K-way merge sorted runs of ranges into a single run, written a block at a time."""
+    runs = [_iterate_range_run(path) for path in run_paths]
+    with open(run_path, 'wb') as run_file:
+        block = array('q')
+        for start_id, end_id in _merge_sorted_ranges(heapq.merge(*runs)):
+            block.append(start_id)
+            block.append(end_id)
+            if len(block) * block.itemsize >= READ_BUFFER_SIZE:
+                block.tofile(run_file)
+                block = array('q')
+        block.tofile(run_file)
+    for path in run_paths:
+        os.remove(path)
+    return run_path
+
+
+def _iterate_range_run(run_path: str) -> Iterator[Tuple[int, int]]:
+    """Read a spilled run of ranges back as (start_id, end_id) pairs."""
+    bounds = _iterate_run(run_path)
+    return zip(bounds, bounds)
+
+
+class FreshIngredientIdRangeIndex:
+    """Lookup index over sorted, merged ID ranges, kept as parallel start and end arrays.
+    The only range that can hold an ID is the last one starting at or before it, found by bisection in O(log R)."""
+
+    def __init__(self, merged_ranges: Union[List[Tuple[int, int]], MappedRanges]):
+        self.merged_ranges = merged_ranges
+        if isinstance(merged_ranges, MappedRanges):  # already parallel arrays, used in place
+            self.starts, self.ends = merged_ranges.starts, merged_ranges.ends
+        else:
+            self.starts = [start_id for start_id, _ in merged_ranges]
+            self.ends = [end_id for _, end_id in merged_ranges]
+        self._int64_arrays = None
+
+    def as_int64_arrays(self):
+        """The starts and ends as NumPy int64 arrays, built once. Raises OverflowError when a bound does not fit in int64."""
+        if self._int64_arrays is None:
+            self._int64_arrays = np.asarray(self.starts, dtype=np.int64), np.asarray(self.ends, dtype=np.int64)
+        return self._int64_arrays
+
+    def __contains__(self, ingredient_id: int) -> bool:
+        i = bisect_right(self.starts, ingredient_id) - 1
+        return i >= 0 and ingredient_id <= self.ends[i]
+
+    def count_distinct_members(self, sorted_ingredient_ids: Iterable[int]) -> int:
+        """Count the distinct IDs falling in a range, sweeping the ascending IDs and the ranges together in O(N + R)."""
+        n_members = 0
+        ranges = zip(self.starts, self.ends)
+        current_range = next(ranges, None)
+        previous_id = None
+        for ingredient_id in sorted_ingredient_ids:
+            if ingredient_id == previous_id:
+                continue
+            previous_id = ingredient_id
+            while current_range is not None and current_range[1] < ingredient_id:
+                current_range = next(ranges, None)
+            if current_range is None:
+                break
+            if current_range[0] <= ingredient_id:
+                n_members += 1
+        return n_members
+
+    def contains_all(self, ingredient_ids: Iterable[int]) -> List[bool]:
+        """Membership of every ID, in order."""
+        starts, ends = self.starts, self.ends
+        memberships = []
+        for ingredient_id in ingredient_ids:
+            i = bisect_right(starts, ingredient_id) - 1
+            memberships.append(i >= 0 and ingredient_id <= ends[i])
+        return memberships
+
+
+class FreshIngredientIdIntervalSet(FreshIngredientIdRangeIndex):
+    """Mutable set of fresh ingredient IDs, kept as sorted, merged ranges in parallel start and end arrays.
+    Adding a range merges it with the ranges it overlaps or touches, removing one splits the ranges it cuts,
+    and n_ids keeps the number of IDs covered up to date. Both locate the affected ranges by bisection in O(log R),
+    then splice the arrays in place."""
+
+    def __init__(self, ranges: Iterable[Tuple[int, int]] = ()):
+        self.starts = []
+        self.ends = []
+        self.n_ids = 0
+        self._int64_arrays = None
+        for start_id, end_id in sorted(ranges):
+            if self.ends and start_id <= self.ends[-1] + 1:  # overlapping or contiguous ranges
+                if end_id > self.ends[-1]:
+                    self.n_ids += end_id - self.ends[-1]
+                    self.ends[-1] = end_id
             else:
-                merged_ranges.append((current_start, current_end))
-                current_start, current_end = start, end
-        
-        merged_ranges.append((current_start, current_end))
-        self.fresh_ingredient_id_ranges = merged_ranges
+                self.starts.append(start_id)
+                self.ends.append(end_id)
+                self.n_ids += end_id - start_id + 1
+
+    @property
+    def merged_ranges(self) -> List[Tuple[int, int]]:
+        return list(zip(self.starts, self.ends))
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return zip(self.starts, self.ends)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def add(self, start_id: int, end_id: int):
+        """Mark the IDs from start_id to end_id, inclusive, as fresh."""
+        if start_id > end_id:
+            return
+        lo = bisect_left(self.ends, start_id - 1)  # first range ending at or after the ID before start_id
+        hi = bisect_right(self.starts, end_id + 1)  # past the last range starting at or before the ID after end_id
+        if lo < hi:
+            start_id = min(start_id, self.starts[lo])
+            end_id = max(end_id, self.ends[hi - 1])
+            self.n_ids -= sum(self.ends[lo:hi]) - sum(self.starts[lo:hi]) + (hi - lo)
+        self.starts[lo:hi] = [start_id]
+        self.ends[lo:hi] = [end_id]
+        self.n_ids += end_id - start_id + 1
+        self._int64_arrays = None
+
+    def remove(self, start_id: int, end_id: int):
+        """Mark the IDs from start_id to end_id, inclusive, as no longer fresh."""
+        if start_id > end_id:
+            return
+        lo = bisect_left(self.ends, start_id)  # first range ending at or after start_id
+        hi = bisect_right(self.starts, end_id)  # past the last range starting at or before end_id
+        if lo >= hi:
+            return
+        remaining_starts, remaining_ends = [], []
+        if self.starts[lo] < start_id:
+            remaining_starts.append(self.starts[lo])
+            remaining_ends.append(start_id - 1)
+        if self.ends[hi - 1] > end_id:
+            remaining_starts.append(end_id + 1)
+            remaining_ends.append(self.ends[hi - 1])
+        self.n_ids -= sum(self.ends[lo:hi]) - sum(self.starts[lo:hi]) + (hi - lo)
+        self.n_ids += sum(remaining_ends) - sum(remaining_starts) + len(remaining_starts)
+        self.starts[lo:hi] = remaining_starts
+        self.ends[lo:hi] = remaining_ends
+        self._int64_arrays = None
 
 
 class FreshIngredientIdChecker:
-    """Class to check fresh ingredient IDs based on """
+    """Class to check fresh ingredient IDs based on the fresh ingredient ID ranges of the database."""
 
-    def __init__(self, fresh_ingredient_db: FreshIngredientDatabase):
+    def __init__(self, fresh_ingredient_db: FreshIngredientDatabase, backend: str = 'auto'):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend}, expected one of {BACKENDS}")
+        if backend == 'numpy' and np is None:
+            raise ImportError("The numpy backend requires NumPy to be installed.")
         self.fresh_ingredient_db = fresh_ingredient_db
+        self.backend = backend
+        self._range_index: Optional[FreshIngredientIdRangeIndex] = None
+
+    @property
+    def range_index(self) -> FreshIngredientIdRangeIndex:
+        """Index over the database's merged ranges, rebuilt when the database has reloaded them."""
+        merged_ranges = self.fresh_ingredient_db.fresh_ingredient_id_ranges
+        if isinstance(merged_ranges, FreshIngredientIdIntervalSet):
+            return merged_ranges
+        if self._range_index is None or self._range_index.merged_ranges is not merged_ranges:
+            self._range_index = FreshIngredientIdRangeIndex(merged_ranges)
+        return self._range_index
 
     def is_fresh_ingredient(self, ingredient_id: int) -> bool:
         """Check if the given ingredient ID is fresh."""
+        return ingredient_id in self.range_index
+
+    def _is_fresh_ingredient_by_scanning(self, ingredient_id: int) -> bool:
+        """Reference implementation of is_fresh_ingredient, scanning every range."""
         for start_id, end_id in self.fresh_ingredient_db.fresh_ingredient_id_ranges:
             if start_id <= ingredient_id <= end_id:
                 return True
         return False
+
+    def are_fresh(self, ingredient_ids: Iterable[int]) -> List[bool]:
+        """Check a batch of ingredient IDs at once, returning whether each one is fresh, in order."""
+        return self.range_index.contains_all(ingredient_ids)
+
+    def fresh_mask(self, ingredient_ids):
+        """Boolean NumPy mask of the fresh IDs among an int64 array (or iterable) of IDs, classified with a single
+        np.searchsorted over the range starts and one comparison against the matching ends.
+        Raises OverflowError when an ID or a range bound does not fit in int64."""
+        starts, ends = self.range_index.as_int64_arrays()
+        ids = ingredient_ids if isinstance(ingredient_ids, np.ndarray) else np.fromiter(ingredient_ids, dtype=np.int64)
+        if len(starts) == 0:
+            return np.zeros(len(ids), dtype=bool)
+        i = np.searchsorted(starts, ids, side='right') - 1
+        return (i >= 0) & (ids <= ends[i])
+
+    def _available_ingredient_id_array(self):
+        """The available IDs as an int64 array, or None when the numpy backend is not in use or an ID or range bound overflows int64.
+        Values beyond int64 fall back to the python backend, whose bisect index handles ints of any size."""
+        available_ids = self.fresh_ingredient_db.available_ingredient_ids
+        if not self._use_numpy_backend(len(available_ids)):
+            return None
+        try:
+            self.range_index.as_int64_arrays()
+            if isinstance(available_ids, memoryview):
+                return np.asarray(available_ids, dtype=np.int64)
+            return np.fromiter(available_ids, dtype=np.int64, count=len(available_ids))
+        except OverflowError:
+            return None
+
+    def _use_numpy_backend(self, n_ids: int) -> bool:
+        """The auto backend switches to NumPy for at least NUMPY_BACKEND_THRESHOLD IDs, when NumPy is available."""
+        if self.backend == 'auto':
+            return np is not None and n_ids >= NUMPY_BACKEND_THRESHOLD
+        return self.backend == 'numpy'
     
+    def count_available_fresh_ingredients(self) -> int:
+        """Count the distinct available fresh ingredient IDs. A streamed database is counted with a sort-merge sweep, without building a set."""
+        available_ids = self.fresh_ingredient_db.available_ingredient_ids
+        if isinstance(available_ids, (SortedIngredientIdSpool, memoryview)):  # already sorted, by the spool or in a snapshot
+            return self.range_index.count_distinct_members(available_ids)
+        ids = self._available_ingredient_id_array()
+        if ids is not None:
+            return int(np.count_nonzero(self.fresh_mask(ids)))
+        return len(self.available_fresh_ingredient_ids())
+
     def available_fresh_ingredient_ids(self) -> Set[int]:
         """Get the set of available fresh ingredient IDs."""
-        fresh_ids = set()
-        for ingredient_id in self.fresh_ingredient_db.available_ingredient_ids:
-            if self.is_fresh_ingredient(ingredient_id):
-                fresh_ids.add(ingredient_id)
-        return fresh_ids
+        ids = self._available_ingredient_id_array()
+        if ids is not None:
+            return set(ids[self.fresh_mask(ids)].tolist())
+        available_ids = self.fresh_ingredient_db.available_ingredient_ids
+        return {ingredient_id for ingredient_id, is_fresh in zip(available_ids, self.are_fresh(available_ids)) if is_fresh}
     
 
 
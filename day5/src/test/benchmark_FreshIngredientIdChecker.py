@@ -0,0 +1,163 @@
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from day5.src.main.python.FreshIngredientIdChecker import FreshIngredientDatabase, FreshIngredientIdChecker, FreshIngredientIdIntervalSet
+
+MAX_ID = 10 ** 15
+
+
+def _random_database(n_ranges: int, n_ids: int, seed: int = 42) -> FreshIngredientDatabase:
+    """Build a database of random ranges, each covering up to 1/n_ranges of the ID space, and random available IDs."""
+    rng = random.Random(seed)
+    fresh_ingredient_db = FreshIngredientDatabase()
+    for _ in range(n_ranges):
+        start_id = rng.randrange(MAX_ID)
+        fresh_ingredient_db.fresh_ingredient_id_ranges.append((start_id, start_id + rng.randrange(MAX_ID // n_ranges)))
+    fresh_ingredient_db._preprocess_fresh_ingredient_id_ranges()
+    fresh_ingredient_db.available_ingredient_ids = {rng.randrange(MAX_ID) for _ in range(n_ids)}
+    return fresh_ingredient_db
+
+
+def _write_input(n_ranges: int, n_ids: int, seed: int = 42, merged: bool = True) -> str:
+    """Write a random puzzle input, the ranges then a blank line then the available IDs, and return its path.
+    Unless merged, the ranges are written as generated, unsorted and overlapping."""
+    rng = random.Random(seed)
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as file:
+        if merged:
+            ranges = _random_database(n_ranges, 0, seed).fresh_ingredient_id_ranges
+        else:
+            ranges = ((start_id, start_id + rng.randrange(MAX_ID // n_ranges)) for start_id in (rng.randrange(MAX_ID) for _ in range(n_ranges)))
+        file.writelines(f"{start_id}-{end_id}\n" for start_id, end_id in ranges)
+        file.write('\n')
+        for offset in range(0, n_ids, 100_000):
+            file.write('\n'.join(str(rng.randrange(MAX_ID)) for _ in range(min(100_000, n_ids - offset))) + '\n')
+        return file.name
+
+
+def _time(fn) -> tuple:
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def benchmark_bisect_against_scanning(n_ranges: int = 10 ** 6, n_ids: int = 10 ** 7):
+    """Compare the bisection index with the linear scan over every merged range."""
+    print("======Bisect index vs linear range scan======")
+    fresh_ingredient_db = _random_database(n_ranges, n_ids)
+    checker = FreshIngredientIdChecker(fresh_ingredient_db)
+    _, index_seconds = _time(lambda: checker.range_index)
+    fresh_ids, bisect_seconds = _time(checker.available_fresh_ingredient_ids)
+    print(f"{len(fresh_ingredient_db.fresh_ingredient_id_ranges)} merged ranges, {n_ids} IDs: "
+          f"index built in {index_seconds:.3f}s, {len(fresh_ids)} fresh found in {bisect_seconds:.3f}s")
+    sample_ids = list(fresh_ingredient_db.available_ingredient_ids)[:100]
+    expected, scanning_seconds = _time(lambda: [checker._is_fresh_ingredient_by_scanning(ingredient_id) for ingredient_id in sample_ids])
+    assert checker.are_fresh(sample_ids) == expected
+    print(f"Linear scan: {scanning_seconds / len(sample_ids) * 1e6:.1f}us per ID, bisect: {bisect_seconds / n_ids * 1e6:.2f}us per ID")
+
+
+def benchmark_streaming_loader(n_ranges: int = 10 ** 4, n_ids: int = 10 ** 7):
+    """Compare loading the available IDs into a set with the streaming spool and its sort-merge count, in time and peak memory."""
+    print("======Streaming spool vs set of available IDs======")
+    filepath = _write_input(n_ranges, n_ids)
+    counts = []
+    for streaming in (False, True):
+        fresh_ingredient_db = FreshIngredientDatabase(streaming=streaming, max_ids_in_memory=10 ** 6)
+        tracemalloc.start()
+        _, load_seconds = _time(lambda: fresh_ingredient_db.load_data_from_file(filepath))
+        n_fresh, count_seconds = _time(FreshIngredientIdChecker(fresh_ingredient_db).count_available_fresh_ingredients)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        counts.append(n_fresh)
+        print(f"{n_ids} IDs, {'streaming' if streaming else 'set'}: load {load_seconds:.3f}s, count {count_seconds:.3f}s, peak {peak_bytes / 2 ** 20:.1f} MiB")
+        if streaming:
+            fresh_ingredient_db.available_ingredient_ids.close()
+    assert counts[0] == counts[1]
+    os.remove(filepath)
+
+
+def benchmark_numpy_against_python_backend(n_ranges: int = 10 ** 5, n_ids: int = 10 ** 7):
+    """Compare the NumPy searchsorted classification with the python backend's bisect loop."""
+    print("======NumPy searchsorted vs bisect loop======")
+    fresh_ingredient_db = _random_database(n_ranges, n_ids)
+    answers = []
+    for backend in ('python', 'numpy'):
+        checker = FreshIngredientIdChecker(fresh_ingredient_db, backend=backend)
+        fresh_ids, set_seconds = _time(checker.available_fresh_ingredient_ids)
+        n_fresh, count_seconds = _time(checker.count_available_fresh_ingredients)
+        answers.append((fresh_ids, n_fresh))
+        print(f"{n_ids} IDs, {backend}: fresh set {set_seconds:.3f}s, count {count_seconds:.3f}s")
+    assert answers[0] == answers[1]
+
+
+def benchmark_online_updates(n_ranges: int = 10 ** 5, n_updates: int = 1000):
+    """Compare editing the interval set in place with re-merging the whole range list after every added range."""
+    print("======Interval set updates vs batch re-merge======")
+    rng = random.Random(42)
+    ranges = _random_database(n_ranges, 0).fresh_ingredient_id_ranges
+    updates = [(start_id, start_id + rng.randrange(MAX_ID // n_ranges)) for start_id in (rng.randrange(MAX_ID) for _ in range(n_updates))]
+    interval_set = FreshIngredientIdIntervalSet(ranges)
+
+    def update_in_place():
+        for i, (start_id, end_id) in enumerate(updates):
+            (interval_set.add if i % 2 == 0 else interval_set.remove)(start_id, end_id)
+        return interval_set.n_ids
+
+    _, in_place_seconds = _time(update_in_place)
+    fresh_ingredient_db = FreshIngredientDatabase()
+    fresh_ingredient_db.fresh_ingredient_id_ranges = list(ranges)
+
+    def remerge_after_each_add():
+        for start_id, end_id in updates[::2]:
+            fresh_ingredient_db.fresh_ingredient_id_ranges.append((start_id, end_id))
+            fresh_ingredient_db._preprocess_fresh_ingredient_id_ranges()
+            fresh_ingredient_db.count_all_theoretically_fresh_ingredients()
+
+    _, remerge_seconds = _time(remerge_after_each_add)
+    print(f"{n_ranges} ranges, {n_updates} updates: in place {in_place_seconds / n_updates * 1e6:.1f}us per update, "
+          f"re-merge {remerge_seconds / len(updates[::2]) * 1e6:.1f}us per added range")
+
+
+def benchmark_external_sort_range_merge(n_ranges: int = 4 * 10 ** 6, max_ranges_in_memory: int = 10 ** 6):
+    """Compare merging the range section in memory with the chunked external sort at several worker counts.
+    Peak memory is traced in the main process only, the workers each hold one chunk."""
+    print("======External sort vs in-memory range merge======")
+    filepath = _write_input(n_ranges, 0, merged=False)
+    expected = None
+    for streaming, workers in [(False, 1), (True, 1), (True, 2), (True, 4)]:
+        fresh_ingredient_db = FreshIngredientDatabase(streaming=streaming, max_ranges_in_memory=max_ranges_in_memory, workers=workers)
+        tracemalloc.start()
+        _, seconds = _time(lambda: fresh_ingredient_db.load_data_from_file(filepath))
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        expected = expected or fresh_ingredient_db.fresh_ingredient_id_ranges
+        assert fresh_ingredient_db.fresh_ingredient_id_ranges == expected
+        label = f"external sort, {workers} workers" if streaming else "in memory"
+        print(f"{n_ranges} ranges, {label}: {seconds:.3f}s, peak {peak_bytes / 2 ** 20:.1f} MiB")
+    os.remove(filepath)
+
+
+def benchmark_snapshot_startup(n_ranges: int = 10 ** 6, n_ids: int = 10 ** 6):
+    """Compare parsing and merging the text input with reopening its mapped binary snapshot, then answering part 1."""
+    print("======Binary snapshot vs text startup======")
+    filepath = _write_input(n_ranges, n_ids, merged=False)
+    snapshot_path = filepath + '.snapshot'
+    fresh_ingredient_db, parse_seconds = _time(lambda: FreshIngredientDatabase.load_with_snapshot(filepath, snapshot_path))
+    _, snapshot_seconds = _time(lambda: FreshIngredientDatabase.load_with_snapshot(filepath, snapshot_path))
+    expected = FreshIngredientIdChecker(fresh_ingredient_db).count_available_fresh_ingredients()
+    n_fresh, answer_seconds = _time(lambda: FreshIngredientIdChecker(FreshIngredientDatabase.load_with_snapshot(filepath, snapshot_path)).count_available_fresh_ingredients())
+    assert n_fresh == expected
+    print(f"{n_ranges} ranges, {n_ids} IDs: parse and save {parse_seconds:.3f}s, reopen snapshot {snapshot_seconds * 1e3:.2f}ms, "
+          f"reopen and answer part 1 {answer_seconds:.3f}s")
+    os.remove(snapshot_path)
+    os.remove(filepath)
+
+
+if __name__ == "__main__":
+    benchmark_bisect_against_scanning()
+    benchmark_streaming_loader()
+    benchmark_numpy_against_python_backend()
+    benchmark_online_updates()
+    benchmark_external_sort_range_merge()
+    benchmark_snapshot_startup()
@@ -0,0 +1,418 @@
+import os
+import pytest
+import random
+import day5.src.main.python.FreshIngredientIdChecker as module
+from day5.src.main.python.FreshIngredientIdChecker import FreshIngredientDatabase, FreshIngredientIdChecker, FreshIngredientIdIntervalSet, FreshIngredientIdRangeIndex, MappedRanges, SortedIngredientIdSpool, ID_RUN_SIZE, RANGE_RUN_SIZE, RESOURCE_DIR
+
+
+def _load_database(filename: str) -> FreshIngredientDatabase:
+    fresh_ingredient_db = FreshIngredientDatabase()
+    fresh_ingredient_db.load_data_from_file(os.path.join(RESOURCE_DIR, filename))
+    return fresh_ingredient_db
+
+
+def _random_ranges(rng: random.Random, n_ranges: int, max_id: int) -> list:
+    ranges = []
+    for _ in range(n_ranges):
+        start_id = rng.randint(0, max_id)
+        ranges.append((start_id, start_id + rng.randint(0, max_id // 10)))
+    return ranges
+
+
+class TestFreshIngredientIdRangeIndex:
+
+    def test_bounds(self):
+        index = FreshIngredientIdRangeIndex([(3, 5), (10, 20)])
+        assert [ingredient_id in index for ingredient_id in [2, 3, 5, 6, 9, 10, 20, 21]] == [False, True, True, False, False, True, True, False]
+
+    def test_empty_index(self):
+        index = FreshIngredientIdRangeIndex([])
+        assert 0 not in index
+        assert index.contains_all([1, 2]) == [False, False]
+
+
+class TestFreshIngredientIdChecker:
+
+    @pytest.fixture
+    def sample_checker(self):
+        return FreshIngredientIdChecker(_load_database("puzzle_input_sample.txt"))
+
+    def test_sample_answers(self, sample_checker):
+        assert sample_checker.available_fresh_ingredient_ids() == {5, 11, 17}
+        assert sample_checker.fresh_ingredient_db.count_all_theoretically_fresh_ingredients() == 14
+
+    def test_puzzle_answers(self):
+        fresh_ingredient_db = _load_database("puzzle_input.txt")
+        assert len(FreshIngredientIdChecker(fresh_ingredient_db).available_fresh_ingredient_ids()) == 623
+        assert fresh_ingredient_db.count_all_theoretically_fresh_ingredients() == 353507173555373
+
+    def test_are_fresh(self, sample_checker):
+        assert sample_checker.are_fresh([1, 5, 8, 11, 17, 32]) == [False, True, False, True, True, False]
+        assert sample_checker.are_fresh(iter([20, 21])) == [True, False]
+
+    def test_index_follows_reloaded_ranges(self, sample_checker):
+        assert not sample_checker.is_fresh_ingredient(8)
+        sample_checker.fresh_ingredient_db.fresh_ingredient_id_ranges = [(1, 10)]
+        assert sample_checker.is_fresh_ingredient(8)
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_scanning_reference(self, seed):
+        rng = random.Random(seed)
+        fresh_ingredient_db = FreshIngredientDatabase()
+        fresh_ingredient_db.fresh_ingredient_id_ranges = _random_ranges(rng, 50, 10_000)
+        fresh_ingredient_db._preprocess_fresh_ingredient_id_ranges()
+        checker = FreshIngredientIdChecker(fresh_ingredient_db)
+        ingredient_ids = [rng.randint(-10, 12_000) for _ in range(1000)]
+        assert checker.are_fresh(ingredient_ids) == [checker._is_fresh_ingredient_by_scanning(ingredient_id) for ingredient_id in ingredient_ids]
+
+
+class TestStreamingLoader:
+
+    @pytest.mark.parametrize("filename, expected", [("puzzle_input_sample.txt", 3), ("puzzle_input.txt", 623)])
+    @pytest.mark.parametrize("max_ids_in_memory", [2, 100, ID_RUN_SIZE])
+    def test_counts_match_set_loader(self, filename, expected, max_ids_in_memory):
+        fresh_ingredient_db = FreshIngredientDatabase(streaming=True, max_ids_in_memory=max_ids_in_memory)
+        fresh_ingredient_db.load_data_from_file(os.path.join(RESOURCE_DIR, filename))
+        assert isinstance(fresh_ingredient_db.available_ingredient_ids, SortedIngredientIdSpool)
+        checker = FreshIngredientIdChecker(fresh_ingredient_db)
+        assert checker.count_available_fresh_ingredients() == expected
+        assert checker.available_fresh_ingredient_ids() == FreshIngredientIdChecker(_load_database(filename)).available_fresh_ingredient_ids()
+        fresh_ingredient_db.available_ingredient_ids.close()
+
+    def test_spool_iterates_sorted_across_runs(self, tmp_path):
+        rng = random.Random(0)
+        ingredient_ids = [rng.randint(-1000, 1000) for _ in range(1000)]
+        spool = SortedIngredientIdSpool(max_ids_in_memory=64)
+        for offset in range(0, len(ingredient_ids), 10):
+            spool.extend(ingredient_ids[offset:offset + 10])
+        assert len(spool._run_paths) > 1
+        assert len(spool) == len(ingredient_ids)
+        assert list(spool) == sorted(ingredient_ids)
+        assert list(spool) == sorted(ingredient_ids)
+        spill_dir = spool._spill_dir
+        spool.close()
+        assert not os.path.exists(spill_dir)
+
+    def test_spool_rejects_ids_above_int64(self):
+        with pytest.raises(OverflowError):
+            SortedIngredientIdSpool().extend([2 ** 63])
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_sweep_matches_set_count(self, tmp_path, seed):
+        rng = random.Random(seed)
+        ranges = _random_ranges(rng, 30, 10_000)
+        ingredient_ids = [rng.randint(0, 12_000) for _ in range(500)]
+        input_file = tmp_path / "input.txt"
+        input_file.write_text('\n'.join(f"{start_id}-{end_id}" for start_id, end_id in ranges) + '\n\n' + '\n'.join(map(str, ingredient_ids)) + '\n')
+        counts = []
+        for streaming in (False, True):
+            fresh_ingredient_db = FreshIngredientDatabase(streaming=streaming, max_ids_in_memory=50)
+            fresh_ingredient_db.load_data_from_file(str(input_file))
+            counts.append(FreshIngredientIdChecker(fresh_ingredient_db).count_available_fresh_ingredients())
+        assert counts[0] == counts[1]
+
+
+class TestNumpyBackend:
+
+    @pytest.fixture(autouse=True)
+    def numpy(self):
+        return pytest.importorskip("numpy")
+
+    @pytest.mark.parametrize("filename", ["puzzle_input_sample.txt", "puzzle_input.txt"])
+    def test_matches_python_backend(self, filename):
+        fresh_ingredient_db = _load_database(filename)
+        numpy_checker = FreshIngredientIdChecker(fresh_ingredient_db, backend='numpy')
+        python_checker = FreshIngredientIdChecker(fresh_ingredient_db, backend='python')
+        assert numpy_checker.available_fresh_ingredient_ids() == python_checker.available_fresh_ingredient_ids()
+        assert numpy_checker.count_available_fresh_ingredients() == python_checker.count_available_fresh_ingredients()
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_mask_matches_are_fresh(self, numpy, seed):
+        rng = random.Random(seed)
+        fresh_ingredient_db = FreshIngredientDatabase()
+        fresh_ingredient_db.fresh_ingredient_id_ranges = _random_ranges(rng, 40, 10_000)
+        fresh_ingredient_db._preprocess_fresh_ingredient_id_ranges()
+        checker = FreshIngredientIdChecker(fresh_ingredient_db, backend='numpy')
+        ingredient_ids = [rng.randint(-100, 12_000) for _ in range(1000)]
+        assert checker.fresh_mask(numpy.array(ingredient_ids)).tolist() == checker.are_fresh(ingredient_ids)
+
+    def test_empty_ranges(self):
+        checker = FreshIngredientIdChecker(FreshIngredientDatabase(), backend='numpy')
+        assert checker.fresh_mask([1, 2]).tolist() == [False, False]
+
+    def test_ids_above_int64_fall_back_to_bisect(self):
+        fresh_ingredient_db = FreshIngredientDatabase()
+        fresh_ingredient_db.fresh_ingredient_id_ranges = [(3, 5), (2 ** 63, 2 ** 64)]
+        fresh_ingredient_db.available_ingredient_ids = {4, 6, 2 ** 63 + 1}
+        checker = FreshIngredientIdChecker(fresh_ingredient_db, backend='numpy')
+        with pytest.raises(OverflowError):
+            checker.fresh_mask([4])
+        assert checker.available_fresh_ingredient_ids() == {4, 2 ** 63 + 1}
+        assert checker.count_available_fresh_ingredients() == 2
+
+    def test_auto_backend_uses_numpy_for_many_ids(self, monkeypatch):
+        checker = FreshIngredientIdChecker(_load_database("puzzle_input.txt"))
+        assert checker._use_numpy_backend(len(checker.fresh_ingredient_db.available_ingredient_ids)) is False
+        monkeypatch.setattr(module, "NUMPY_BACKEND_THRESHOLD", 100)
+        assert checker._use_numpy_backend(len(checker.fresh_ingredient_db.available_ingredient_ids)) is True
+        assert checker.count_available_fresh_ingredients() == 623
+
+    def test_numpy_backend_without_numpy_raises(self, monkeypatch):
+        monkeypatch.setattr(module, "np", None)
+        with pytest.raises(ImportError, match="requires NumPy"):
+            FreshIngredientIdChecker(FreshIngredientDatabase(), backend='numpy')
+        assert FreshIngredientIdChecker(_load_database("puzzle_input_sample.txt")).count_available_fresh_ingredients() == 3
+
+    def test_unknown_backend_raises(self):
+        with pytest.raises(ValueError, match="Unknown backend"):
+            FreshIngredientIdChecker(FreshIngredientDatabase(), backend='gpu')
+
+
+def _batch_merge(ranges: list) -> list:
+    fresh_ingredient_db = FreshIngredientDatabase()
+    fresh_ingredient_db.fresh_ingredient_id_ranges = list(ranges)
+    fresh_ingredient_db._preprocess_fresh_ingredient_id_ranges()
+    return fresh_ingredient_db.fresh_ingredient_id_ranges
+
+
+class TestFreshIngredientIdIntervalSet:
+
+    def test_add_merges_overlapping_and_contiguous_ranges(self):
+        interval_set = FreshIngredientIdIntervalSet([(3, 5), (10, 14)])
+        interval_set.add(6, 6)
+        assert interval_set.merged_ranges == [(3, 6), (10, 14)]
+        interval_set.add(7, 9)
+        assert interval_set.merged_ranges == [(3, 14)]
+        interval_set.add(20, 25)
+        interval_set.add(0, 1)
+        assert interval_set.merged_ranges == [(0, 1), (3, 14), (20, 25)]
+        assert interval_set.n_ids == 2 + 12 + 6
+
+    def test_remove_splits_ranges(self):
+        interval_set = FreshIngredientIdIntervalSet([(3, 20)])
+        interval_set.remove(10, 12)
+        assert interval_set.merged_ranges == [(3, 9), (13, 20)]
+        interval_set.remove(0, 3)
+        interval_set.remove(20, 30)
+        assert interval_set.merged_ranges == [(4, 9), (13, 19)]
+        interval_set.remove(5, 15)
+        assert interval_set.merged_ranges == [(4, 4), (16, 19)]
+        assert interval_set.n_ids == 5
+        assert 4 in interval_set and 5 not in interval_set and 16 in interval_set
+
+    def test_empty_ranges_are_ignored(self):
+        interval_set = FreshIngredientIdIntervalSet()
+        interval_set.add(5, 4)
+        interval_set.remove(5, 4)
+        assert interval_set.merged_ranges == [] and interval_set.n_ids == 0
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_adds_match_batch_merge(self, seed):
+        rng = random.Random(seed)
+        ranges = _random_ranges(rng, 60, 1000)
+        interval_set = FreshIngredientIdIntervalSet()
+        for i, (start_id, end_id) in enumerate(ranges):
+            interval_set.add(start_id, end_id)
+            assert interval_set.merged_ranges == _batch_merge(ranges[:i + 1])
+        assert FreshIngredientIdIntervalSet(ranges).merged_ranges == interval_set.merged_ranges
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_adds_and_removes_match_a_set_of_ids(self, seed):
+        rng = random.Random(seed)
+        interval_set = FreshIngredientIdIntervalSet()
+        fresh_ids = set()
+        for _ in range(200):
+            start_id = rng.randint(0, 300)
+            end_id = start_id + rng.randint(0, 40)
+            if rng.random() < 0.6:
+                interval_set.add(start_id, end_id)
+                fresh_ids.update(range(start_id, end_id + 1))
+            else:
+                interval_set.remove(start_id, end_id)
+                fresh_ids.difference_update(range(start_id, end_id + 1))
+            assert interval_set.merged_ranges == _batch_merge([(i, i) for i in fresh_ids])
+            assert interval_set.n_ids == len(fresh_ids)
+        assert interval_set.contains_all(range(-1, 350)) == [i in fresh_ids for i in range(-1, 350)]
+
+
+class TestOnlineDatabaseUpdates:
+
+    def test_sample_updates(self):
+        fresh_ingredient_db = _load_database("puzzle_input_sample.txt")
+        checker = FreshIngredientIdChecker(fresh_ingredient_db)
+        assert fresh_ingredient_db.count_all_theoretically_fresh_ingredients() == 14
+        fresh_ingredient_db.add_fresh_ingredient_id_range(6, 9)
+        assert fresh_ingredient_db.count_all_theoretically_fresh_ingredients() == 18
+        assert checker.available_fresh_ingredient_ids() == {5, 8, 11, 17}
+        fresh_ingredient_db.remove_fresh_ingredient_id_range(11, 11)
+        assert fresh_ingredient_db.count_all_theoretically_fresh_ingredients() == 17
+        assert checker.available_fresh_ingredient_ids() == {5, 8, 17}
+        assert list(fresh_ingredient_db.fresh_ingredient_id_ranges) == [(3, 10), (12, 20)]
+
+    def test_loading_more_ranges_after_updates(self, tmp_path):
+        fresh_ingredient_db = _load_database("puzzle_input_sample.txt")
+        fresh_ingredient_db.add_fresh_ingredient_id_range(6, 9)
+        more_path = tmp_path / "more.txt"
+        more_path.write_text("30-40\n\n32\n35\n")
+        fresh_ingredient_db.load_data_from_file(str(more_path))
+        assert list(fresh_ingredient_db.fresh_ingredient_id_ranges) == [(3, 20), (30, 40)]
+        assert fresh_ingredient_db.count_all_theoretically_fresh_ingredients() == 29
+        assert FreshIngredientIdChecker(fresh_ingredient_db).available_fresh_ingredient_ids() == {5, 8, 11, 17, 32, 35}
+
+    def test_numpy_backend_sees_updates(self):
+        pytest.importorskip("numpy")
+        fresh_ingredient_db = _load_database("puzzle_input_sample.txt")
+        checker = FreshIngredientIdChecker(fresh_ingredient_db, backend='numpy')
+        assert checker.count_available_fresh_ingredients() == 3
+        fresh_ingredient_db.add_fresh_ingredient_id_range(30, 40)
+        assert checker.count_available_fresh_ingredients() == 4
+
+
+class TestExternalSortRangeMerge:
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    @pytest.mark.parametrize("max_ranges_in_memory", [1, 7, RANGE_RUN_SIZE])
+    def test_puzzle_matches_in_memory_merge(self, workers, max_ranges_in_memory):
+        expected = _load_database("puzzle_input.txt")
+        fresh_ingredient_db = FreshIngredientDatabase(streaming=True, max_ranges_in_memory=max_ranges_in_memory, workers=workers)
+        fresh_ingredient_db.load_data_from_file(os.path.join(RESOURCE_DIR, "puzzle_input.txt"))
+        assert fresh_ingredient_db.fresh_ingredient_id_ranges == expected.fresh_ingredient_id_ranges
+        assert fresh_ingredient_db.count_all_theoretically_fresh_ingredients() == 353507173555373
+        assert FreshIngredientIdChecker(fresh_ingredient_db).count_available_fresh_ingredients() == 623
+        fresh_ingredient_db.available_ingredient_ids.close()
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_random_ranges_match_batch_merge(self, tmp_path, seed):
+        rng = random.Random(seed)
+        ranges = _random_ranges(rng, 200, 5000)
+        input_file = tmp_path / "input.txt"
+        input_file.write_text('\n'.join(f"{start_id}-{end_id}" for start_id, end_id in ranges) + '\n\n1\n')
+        fresh_ingredient_db = FreshIngredientDatabase(streaming=True, max_ranges_in_memory=20, workers=2)
+        fresh_ingredient_db.load_data_from_file(str(input_file))
+        assert fresh_ingredient_db.fresh_ingredient_id_ranges == _batch_merge(ranges)
+        assert len(fresh_ingredient_db.available_ingredient_ids) == 1
+
+    def test_empty_range_section(self, tmp_path):
+        input_file = tmp_path / "input.txt"
+        input_file.write_text("\n5\n")
+        fresh_ingredient_db = FreshIngredientDatabase(streaming=True)
+        fresh_ingredient_db.load_data_from_file(str(input_file))
+        assert fresh_ingredient_db.fresh_ingredient_id_ranges == []
+        assert FreshIngredientIdChecker(fresh_ingredient_db).count_available_fresh_ingredients() == 0
+
+    def test_merges_runs_in_passes_past_the_fan_in(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(module, "MAX_MERGE_FAN_IN", 3)
+        rng = random.Random(0)
+        ranges = _random_ranges(rng, 100, 5000)
+        input_file = tmp_path / "input.txt"
+        input_file.write_text('\n'.join(f"{start_id}-{end_id}" for start_id, end_id in ranges) + '\n\n')
+        fresh_ingredient_db = FreshIngredientDatabase(streaming=True, max_ranges_in_memory=8)
+        fresh_ingredient_db.load_data_from_file(str(input_file))
+        assert fresh_ingredient_db.fresh_ingredient_id_ranges == _batch_merge(ranges)
+
+
+class TestSnapshot:
+
+    @pytest.fixture
+    def puzzle_copy(self, tmp_path):
+        source_path = tmp_path / "puzzle_input.txt"
+        with open(os.path.join(RESOURCE_DIR, "puzzle_input.txt"), 'rb') as f:
+            source_path.write_bytes(f.read())
+        return str(source_path)
+
+    def test_reopened_snapshot_answers_like_the_text(self, puzzle_copy):
+        expected = FreshIngredientDatabase()
+        expected.load_data_from_file(puzzle_copy)
+        expected.save_snapshot(puzzle_copy + ".snapshot", puzzle_copy)
+        fresh_ingredient_db = FreshIngredientDatabase.open_snapshot(puzzle_copy + ".snapshot", puzzle_copy)
+        assert isinstance(fresh_ingredient_db.fresh_ingredient_id_ranges, MappedRanges)
+        assert list(fresh_ingredient_db.fresh_ingredient_id_ranges) == expected.fresh_ingredient_id_ranges
+        assert list(fresh_ingredient_db.available_ingredient_ids) == sorted(expected.available_ingredient_ids)
+        assert fresh_ingredient_db.count_all_theoretically_fresh_ingredients() == 353507173555373
+        checker = FreshIngredientIdChecker(fresh_ingredient_db, backend='python')
+        assert checker.count_available_fresh_ingredients() == 623
+        assert checker.available_fresh_ingredient_ids() == FreshIngredientIdChecker(expected).available_fresh_ingredient_ids()
+
+    def test_numpy_backend_on_snapshot(self, puzzle_copy):
+        pytest.importorskip("numpy")
+        fresh_ingredient_db = FreshIngredientDatabase.load_with_snapshot(puzzle_copy)
+        fresh_ingredient_db = FreshIngredientDatabase.load_with_snapshot(puzzle_copy)
+        checker = FreshIngredientIdChecker(fresh_ingredient_db, backend='numpy')
+        assert len(checker.available_fresh_ingredient_ids()) == 623
+        assert checker.fresh_mask([3, 10 ** 18]).tolist() == checker.are_fresh([3, 10 ** 18])
+
+    def test_load_with_snapshot_reuses_a_fresh_snapshot(self, puzzle_copy, monkeypatch):
+        FreshIngredientDatabase.load_with_snapshot(puzzle_copy)
+        assert os.path.exists(puzzle_copy + ".snapshot")
+        monkeypatch.setattr(FreshIngredientDatabase, "load_data_from_file", lambda self, file_path: pytest.fail("text parsed again"))
+        fresh_ingredient_db = FreshIngredientDatabase.load_with_snapshot(puzzle_copy)
+        assert isinstance(fresh_ingredient_db.fresh_ingredient_id_ranges, MappedRanges)
+
+    def test_touched_source_is_still_fresh_when_content_matches(self, puzzle_copy):
+        FreshIngredientDatabase.load_with_snapshot(puzzle_copy)
+        os.utime(puzzle_copy, ns=(0, 10 ** 18))
+        assert FreshIngredientDatabase.open_snapshot(puzzle_copy + ".snapshot", puzzle_copy) is not None
+
+    def test_changed_source_invalidates_the_snapshot(self, puzzle_copy):
+        FreshIngredientDatabase.load_with_snapshot(puzzle_copy)
+        stat = os.stat(puzzle_copy)
+        with open(puzzle_copy, 'r+b') as f:
+            content = f.read()
+            f.seek(0)
+            f.write(content.replace(b'\n\n', b'\n1-1\n\n', 1)[:len(content)])
+        os.utime(puzzle_copy, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        assert FreshIngredientDatabase.open_snapshot(puzzle_copy + ".snapshot", puzzle_copy) is None
+        fresh_ingredient_db = FreshIngredientDatabase.load_with_snapshot(puzzle_copy)
+        assert (1, 1) in list(fresh_ingredient_db.fresh_ingredient_id_ranges)
+        assert FreshIngredientDatabase.open_snapshot(puzzle_copy + ".snapshot", puzzle_copy) is not None
+
+    def test_snapshot_without_ids(self, puzzle_copy):
+        fresh_ingredient_db = FreshIngredientDatabase()
+        fresh_ingredient_db.load_data_from_file(puzzle_copy)
+        fresh_ingredient_db.save_snapshot(puzzle_copy + ".snapshot", puzzle_copy, include_ids=False)
+        reopened = FreshIngredientDatabase.open_snapshot(puzzle_copy + ".snapshot", puzzle_copy)
+        assert reopened.available_ingredient_ids == set()
+        assert reopened.count_all_theoretically_fresh_ingredients() == 353507173555373
+
+    def test_streamed_database_snapshot_drops_duplicate_ids(self, tmp_path):
+        source_path = tmp_path / "input.txt"
+        source_path.write_text("3-5\n10-14\n\n5\n5\n11\n1\n")
+        fresh_ingredient_db = FreshIngredientDatabase(streaming=True)
+        fresh_ingredient_db.load_data_from_file(str(source_path))
+        fresh_ingredient_db.save_snapshot(str(tmp_path / "snapshot"), str(source_path))
+        reopened = FreshIngredientDatabase.open_snapshot(str(tmp_path / "snapshot"), str(source_path))
+        assert list(reopened.available_ingredient_ids) == [1, 5, 11]
+        assert FreshIngredientIdChecker(reopened).count_available_fresh_ingredients() == 2
+
+    @pytest.mark.parametrize("content", ["3-5\n10-99999999999999999999\n\n5\n11\n", "3-5\n10-14\n\n5\n11\n99999999999999999999\n"])
+    def test_load_with_snapshot_skips_values_beyond_int64(self, tmp_path, content):
+        source_path = tmp_path / "input.txt"
+        source_path.write_text(content)
+        fresh_ingredient_db = FreshIngredientDatabase.load_with_snapshot(str(source_path))
+        assert FreshIngredientIdChecker(fresh_ingredient_db, backend='python').count_available_fresh_ingredients() == 2
+        assert not os.path.exists(str(source_path) + ".snapshot")
+        assert os.listdir(tmp_path) == ["input.txt"]
+
+    @pytest.mark.parametrize("content", [b"", b"not a snapshot", b"AOC25D5S" + bytes(100)])
+    def test_invalid_snapshots_are_ignored(self, tmp_path, content):
+        snapshot_path = tmp_path / "snapshot"
+        snapshot_path.write_bytes(content)
+        assert FreshIngredientDatabase.open_snapshot(str(snapshot_path)) is None
+        assert FreshIngredientDatabase.open_snapshot(str(tmp_path / "missing")) is None
+
+    def test_edits_after_reopening(self, puzzle_copy):
+        fresh_ingredient_db = FreshIngredientDatabase.load_with_snapshot(puzzle_copy)
+        fresh_ingredient_db = FreshIngredientDatabase.load_with_snapshot(puzzle_copy)
+        n_ids = fresh_ingredient_db.count_all_theoretically_fresh_ingredients()
+        fresh_ingredient_db.add_fresh_ingredient_id_range(1, 1)
+        assert fresh_ingredient_db.count_all_theoretically_fresh_ingredients() == n_ids + 1
+
+    def test_loading_more_ranges_after_reopening(self, puzzle_copy, tmp_path):
+        FreshIngredientDatabase.load_with_snapshot(puzzle_copy)
+        fresh_ingredient_db = FreshIngredientDatabase.load_with_snapshot(puzzle_copy)
+        n_ids = fresh_ingredient_db.count_all_theoretically_fresh_ingredients()
+        more_path = tmp_path / "more.txt"
+        more_path.write_text("1-1\n\n1\n")
+        fresh_ingredient_db.load_data_from_file(str(more_path))
+        assert fresh_ingredient_db.count_all_theoretically_fresh_ingredients() == n_ids + 1
+        assert FreshIngredientIdChecker(fresh_ingredient_db, backend='python').count_available_fresh_ingredients() == 624